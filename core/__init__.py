@@ -1,3 +1,3 @@
 # Core module - backend processing
-from .scanner import ScanWorker
+from .scanner import ScanWorker, ScanRunnable
 from .db_manager import DBManager
@@ -2,8 +2,10 @@
 db_manager.py - SmartMediaCleaner
 SQLiteデータベースを管理するクラス
 """
+import queue
 import sqlite3
-from typing import Optional, Dict
+import threading
+from typing import Dict, Optional, List, Tuple
 
 
 class DBManager:
@@ -13,31 +15,100 @@ class DBManager:
     """
 
     # 現在のスキーマバージョン
-    SCHEMA_VERSION = 2
+    # 解析アルゴリズムを変更した場合も上げる (古いキャッシュは破棄される)
+    SCHEMA_VERSION = 13
+
+    # 書き込みスレッドが1トランザクションでまとめる最大件数
+    WRITER_BATCH_SIZE = 500
+
+    # SQL文は定数化して sqlite3 のステートメントキャッシュを常にヒットさせる
+    _GET_SQL = """SELECT last_modified, file_size, blur_score, phash, video_hash,
+                  face_count, video_duration, video_frame_hash
+                  FROM media_cache WHERE file_path = ?"""
+    _LOAD_ALL_SQL = """SELECT file_path, last_modified, file_size, blur_score, phash, video_hash,
+                       face_count, video_duration, video_frame_hash FROM media_cache"""
+    _UPSERT_SQL = '''
+        INSERT OR REPLACE INTO media_cache
+        (file_path, last_modified, file_size, blur_score, phash, video_hash,
+         face_count, video_duration, video_frame_hash)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    '''
+
+    # 接続ごとのプリペアドステートメントキャッシュ (既定は128)
+    _CACHED_STATEMENTS = 256
 
     def __init__(self, db_path: str = "media_cache.db"):
         self.db_path = db_path
-        self.conn = None
-        self.cursor = None
+        # スレッドごとに専用の接続を持つ (WALで読み取りを並行化)
+        self._local = threading.local()
+        self._connections = []
+        self._conn_lock = threading.Lock()
         self._init_db()
 
+    @property
+    def conn(self) -> sqlite3.Connection:
+        """呼び出し元スレッド専用の接続"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._connect()
+        return conn
+
+    @property
+    def cursor(self) -> sqlite3.Cursor:
+        """呼び出し元スレッド専用のカーソル"""
+        cursor = getattr(self._local, "cursor", None)
+        if cursor is None:
+            self._connect()
+            cursor = self._local.cursor
+        return cursor
+
+    @property
+    def insert_cursor(self) -> sqlite3.Cursor:
+        """
+        UPSERT 専用カーソル (スレッドごと)
+        同じカーソルで同じSQLを実行し続け、準備済みステートメントを再利用する
+        """
+        cursor = getattr(self._local, "insert_cursor", None)
+        if cursor is None:
+            cursor = self.conn.cursor()
+            self._local.insert_cursor = cursor
+        return cursor
+
+    def _connect(self) -> sqlite3.Connection:
+        """現在のスレッド用の接続を作成"""
+        conn = sqlite3.connect(self.db_path, check_same_thread=False,
+                               cached_statements=self._CACHED_STATEMENTS)
+        conn.row_factory = sqlite3.Row  # 列名でアクセス可能な行 (dict生成を省略)
+        self._local.conn = conn
+        self._local.cursor = conn.cursor()
+        self._local.insert_cursor = None
+        with self._conn_lock:
+            self._connections.append(conn)
+        self._apply_pragmas()
+        return conn
+
     def _init_db(self):
         """データベース接続とテーブル作成を行います。"""
         try:
-            self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
-            self.cursor = self.conn.cursor()
-            
+            self._connect()
+
+            # バージョン不一致のキャッシュは互換性がないため作り直す
+            self.cursor.execute("PRAGMA user_version")
+            if self.cursor.fetchone()[0] != self.SCHEMA_VERSION:
+                self.cursor.execute("DROP TABLE IF EXISTS media_cache")
+                self.cursor.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
+
             self.cursor.execute('''
                 CREATE TABLE IF NOT EXISTS media_cache (
                     file_path TEXT PRIMARY KEY,
                     last_modified REAL,
                     file_size INTEGER,
                     blur_score REAL,
-                    phash TEXT,
+                    phash INTEGER,
                     video_hash TEXT,
                     face_count INTEGER,
                     video_duration REAL,
-                    video_frame_hash TEXT
+                    video_frame_hash INTEGER
                 )
             ''')
             self.conn.commit()
@@ -47,6 +118,20 @@ class DBManager:
         except sqlite3.Error as e:
             print(f"DB初期化エラー: {e}")
 
+    def _apply_pragmas(self):
+        """
+        接続ごとのチューニング設定
+        WAL + synchronous=NORMAL でコミット毎の fsync を避ける
+        """
+        # インメモリDBは WAL に対応しないためジャーナル設定をスキップ
+        if self.db_path != ":memory:":
+            self.cursor.execute("PRAGMA journal_mode=WAL")
+            self.cursor.execute("PRAGMA synchronous=NORMAL")
+            self.cursor.execute("PRAGMA wal_autocheckpoint=1000")
+        self.cursor.execute("PRAGMA temp_store=MEMORY")
+        self.cursor.execute("PRAGMA cache_size=-65536")  # 64MB
+        self.cursor.execute("PRAGMA busy_timeout=30000")
+
     def _migrate_schema(self):
         """既存テーブルに新しいカラムを追加 (マイグレーション)"""
         try:
@@ -56,7 +141,7 @@ class DBManager:
             new_columns = [
                 ("face_count", "INTEGER"),
                 ("video_duration", "REAL"),
-                ("video_frame_hash", "TEXT")
+                ("video_frame_hash", "INTEGER")
             ]
             
             for col_name, col_type in new_columns:
@@ -68,58 +153,71 @@ class DBManager:
         except sqlite3.Error as e:
             print(f"マイグレーションエラー: {e}")
 
-    def get_cache(self, file_path: str) -> Optional[Dict]:
-        """キャッシュ情報を取得"""
+    def get_cache(self, file_path: str) -> Optional[sqlite3.Row]:
+        """キャッシュ情報を取得 (row['phash'] のように列名で参照可能)"""
         try:
-            query = """SELECT last_modified, file_size, blur_score, phash, video_hash,
-                       face_count, video_duration, video_frame_hash 
-                       FROM media_cache WHERE file_path = ?"""
-            self.cursor.execute(query, (file_path,))
-            row = self.cursor.fetchone()
-            
-            if row:
-                return {
-                    "last_modified": row[0],
-                    "file_size": row[1],
-                    "blur_score": row[2],
-                    "phash": row[3],
-                    "video_hash": row[4],
-                    "face_count": row[5],
-                    "video_duration": row[6],
-                    "video_frame_hash": row[7]
-                }
-            return None
+            self.cursor.execute(self._GET_SQL, (file_path,))
+            return self.cursor.fetchone()
         except sqlite3.Error as e:
             print(f"キャッシュ取得エラー: {e}")
             return None
 
-    def upsert_cache(self, file_path: str, last_modified: float, file_size: int, 
-                     blur_score: Optional[float] = None, phash: Optional[str] = None, 
-                     video_hash: Optional[str] = None, face_count: Optional[int] = None,
-                     video_duration: Optional[float] = None, video_frame_hash: Optional[str] = None):
-        """キャッシュ情報を挿入または更新"""
+    def load_all(self) -> Dict[str, sqlite3.Row]:
+        """
+        キャッシュ全件を1回の SELECT で読み込む (file_path -> 行)
+        有効性 (更新日時/サイズ) の判定は呼び出し側で行う
+        """
         try:
-            query = '''
-                INSERT OR REPLACE INTO media_cache 
-                (file_path, last_modified, file_size, blur_score, phash, video_hash,
-                 face_count, video_duration, video_frame_hash)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            '''
-            self.cursor.execute(query, (file_path, last_modified, file_size, blur_score, 
-                                        phash, video_hash, face_count, video_duration, video_frame_hash))
-            self.conn.commit()
+            self.cursor.execute(self._LOAD_ALL_SQL)
+            return {row['file_path']: row for row in self.cursor.fetchall()}
         except sqlite3.Error as e:
-            print(f"キャッシュ保存エラー: {e}")
+            print(f"キャッシュ一括取得エラー: {e}")
+            return {}
+
+    def upsert_many(self, rows: List[Tuple]):
+        """
+        キャッシュ情報をまとめて挿入または更新 (1トランザクション)
+        rows: [(file_path, last_modified, file_size, blur_score, phash, video_hash,
+                face_count, video_duration, video_frame_hash), ...]
+        """
+        if not rows:
+            return
+        try:
+            with self.conn:
+                self.insert_cursor.executemany(self._UPSERT_SQL, rows)
+        except sqlite3.Error as e:
+            print(f"キャッシュ一括保存エラー: {e}")
+
+    def start_writer(self, write_queue: queue.Queue) -> threading.Thread:
+        """
+        書き込み専用スレッドを開始
+        write_queue に upsert_many と同じ形式の行を put し、最後に None を put すると終了する
+        """
+        thread = threading.Thread(target=self._writer_loop, args=(write_queue,), daemon=True)
+        thread.start()
+        return thread
 
-    def is_cache_valid(self, file_path: str, current_mtime: float, current_size: int) -> bool:
-        """キャッシュが有効かどうかを確認"""
-        cache = self.get_cache(file_path)
-        if not cache:
-            return False
-        return (abs(cache['last_modified'] - current_mtime) < 0.001 and 
-                cache['file_size'] == current_size)
+    def _writer_loop(self, write_queue: queue.Queue):
+        """キューに溜まった行を最大 WRITER_BATCH_SIZE 件ずつまとめてコミット"""
+        while True:
+            row = write_queue.get()
+            rows = []
+            while row is not None:
+                rows.append(row)
+                if len(rows) >= self.WRITER_BATCH_SIZE:
+                    break
+                try:
+                    row = write_queue.get_nowait()
+                except queue.Empty:
+                    break
+            self.upsert_many(rows)
+            if row is None:
+                break
 
     def close(self):
-        """データベース接続を閉じます。"""
-        if self.conn:
-            self.conn.close()
+        """データベース接続を閉じます (全スレッド分)。"""
+        with self._conn_lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            conn.close()
+        self._local = threading.local()
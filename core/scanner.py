@@ -2,221 +2,574 @@
 scanner.py - SmartMediaCleaner
 スキャン処理をバックグラウンドで実行するワーカークラス
 """
+import io
 import os
+import queue
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import cv2
-import imagehash
 from PIL import Image
-import hashlib
 import numpy as np
-from PySide6.QtCore import QObject, Signal
-from typing import List, Dict, Tuple, Optional
+import xxhash
+from PySide6.QtCore import QObject, QRunnable, Signal
+from typing import Iterator, List, Dict, Tuple, Optional
 from .db_manager import DBManager
+from .similarity import group_hashes
+
+try:
+    from numba import njit  # 任意依存: ブレ判定の高速化
+except ImportError:
+    njit = None
 
 # システムフォルダや除外すべき拡張子
 EXCLUDED_DIRS = {'.git', 'System Volume Information', '$RECYCLE.BIN', '__pycache__'}
 IMAGE_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.bmp', '.tiff', '.webp'}
 VIDEO_EXTENSIONS = {'.mp4', '.avi', '.mov', '.mkv', '.flv', '.wmv'}
 
+# str.endswith 用に事前にタプル化しておく
+# (拡張子を切り出して set で引くより、タプルを渡した endswith 1回の方が速い)
+_IMAGE_EXT_TUPLE = tuple(IMAGE_EXTENSIONS)
+_VIDEO_EXT_TUPLE = tuple(VIDEO_EXTENSIONS)
+_MEDIA_EXT_TUPLE = _IMAGE_EXT_TUPLE + _VIDEO_EXT_TUPLE
+
 # 顔検出用カスケード分類器のパス
 FACE_CASCADE_PATH = cv2.data.haarcascades + 'haarcascade_frontalface_default.xml'
 
+# DNN顔検出モデル (YuNet) のパス - 配置されていれば Haar より優先して使用
+# https://github.com/opencv/opencv_zoo/tree/main/models/face_detection_yunet
+FACE_YUNET_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                               "models", "face_detection_yunet_2023mar.onnx")
+
+# ブレ判定に使う中央部分の一辺 (px)
+# 縮小するとボケも一緒に消えるため、原寸のまま中央を切り出して計算する
+BLUR_CROP_SIZE = 1024
+
+# pHash/顔検出用に縮小する長辺サイズ (px)
+ANALYSIS_MAX_EDGE = 512
+
+# 類似画像とみなす pHash のハミング距離 (0 = 完全一致のみ)
+SIMILAR_HASH_DISTANCE = 4
+
+# 顔検出結果のメモ化: pHash 上位の比較ビット数と最大件数
+FACE_CACHE_PREFIX_BITS = 40
+FACE_CACHE_SIZE = 5000
+
+# 進捗シグナルの最小送信間隔 (秒, 約30Hz)
+PROGRESS_INTERVAL = 0.033
+
+
+if njit is not None:
+    @njit(cache=True, fastmath=True, nogil=True)
+    def _laplacian_variance(gray):
+        """
+        4近傍ラプラシアンと分散を1パスで計算 (float画像を確保しない)
+        ファイル単位でスレッド並列化しているためカーネル内は逐次実行
+        """
+        height, width = gray.shape
+        n = (height - 2) * (width - 2)
+        if n <= 0:
+            return 0.0
+        total = 0.0
+        total_sq = 0.0
+        for i in range(1, height - 1):
+            for j in range(1, width - 1):
+                v = (4.0 * gray[i, j] - gray[i - 1, j] - gray[i + 1, j]
+                     - gray[i, j - 1] - gray[i, j + 1])
+                total += v
+                total_sq += v * v
+        mean = total / n
+        return total_sq / n - mean * mean
+else:
+    def _laplacian_variance(gray):
+        """4近傍ラプラシアンの分散 (numba 未導入時は OpenCV で計算、端の1pxは除外)"""
+        return cv2.Laplacian(gray, cv2.CV_32F)[1:-1, 1:-1].var()
+
+
+def _iter_media_files(folder_path: str, recursive: bool) -> Iterator[Tuple[str, os.stat_result]]:
+    """
+    os.scandir でフォルダを走査し、メディアファイルの (パス, stat) を返す
+    DirEntry のキャッシュを使うため os.walk + os.stat より stat 呼び出しが少ない
+    """
+    stack = [folder_path]
+    while stack:
+        current = stack.pop()
+        try:
+            with os.scandir(current) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if recursive and entry.name not in EXCLUDED_DIRS:
+                                stack.append(entry.path)
+                        elif entry.name.lower().endswith(_MEDIA_EXT_TUPLE) and entry.is_file():
+                            yield entry.path, entry.stat()
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+
+
+def _center_crop(gray: np.ndarray, size: int) -> np.ndarray:
+    """中央の size x size を切り出す (画像の方が小さい辺はそのまま)"""
+    height, width = gray.shape[:2]
+    top = max(0, (height - size) // 2)
+    left = max(0, (width - size) // 2)
+    return gray[top:top + size, left:left + size]
+
+
+# 符号付き64bit整数の pHash を符号なしに戻すマスク
+PHASH_MASK = (1 << 64) - 1
+
+
+def _phash_gray(gray: np.ndarray) -> int:
+    """
+    グレースケール画像の pHash (64bit)
+    32x32 に縮小 → DCT → 低周波 8x8 を中央値で2値化 (imagehash.phash と同じ手順)
+    SQLite の INTEGER にそのまま格納できるよう符号付き64bit整数で返す
+    """
+    small = cv2.resize(gray, (32, 32), interpolation=cv2.INTER_AREA).astype(np.float32)
+    low_freq = cv2.dct(small)[:8, :8]
+    bits = (low_freq > np.median(low_freq)).flatten()
+    return int(np.packbits(bits).view('>i8')[0])
+
+
+class _ShotArrays:
+    """
+    類似判定用の画像情報を列ごとの配列で保持 (SoA)
+    ファイルごとのタプルを作らず、phash_map にはインデックスのみを持たせる
+    """
+
+    def __init__(self, capacity: int):
+        self.paths: List[str] = []
+        self.blur = np.empty(capacity, dtype=np.float32)
+        self.faces = np.empty(capacity, dtype=np.int16)
+        self.size = np.empty(capacity, dtype=np.int64)
+
+    def append(self, path: str, blur: float, faces: int, size: int) -> int:
+        i = len(self.paths)
+        self.paths.append(path)
+        self.blur[i] = blur
+        self.faces[i] = faces
+        self.size[i] = size
+        return i
+
+    def items(self, ids: List[int]) -> List[Tuple[str, float, int, int]]:
+        """UI に渡す (path, blur, faces, size) のリストに展開"""
+        return [(self.paths[i], float(self.blur[i]), int(self.faces[i]), int(self.size[i]))
+                for i in ids]
+
+
+def _new_results(similar_distance: int = SIMILAR_HASH_DISTANCE) -> dict:
+    """スキャン結果の入れ物"""
+    return {
+        "scanned_count": 0,
+        "similar_distance": similar_distance,  # similar_groups をまとめたハミング距離
+        "blur_images": [],
+        "similar_groups": {},
+        "duplicate_videos": {},
+        "image_metadata": {},
+        "corrupted_files": []  # 破損ファイルリスト: [(path, error_message), ...]
+    }
+
 
 class ScanWorker(QObject):
     """
     スキャン処理をバックグラウンドで実行するワーカークラス。
     """
-    progress = Signal(int, int, str)  # current, total, filename
-    finished = Signal(dict)           # results
+    progress = Signal(int, int)       # current, total (ファイル名は current_name() で取得)
+    finished = Signal(dict, dict)     # results, summary (件数の集計)
     log = Signal(str)                 # log messages
 
-    def __init__(self, folder_path: str, blur_threshold: float = 100.0, recursive: bool = True):
+    def __init__(self, folder_path: str, blur_threshold: float = 100.0, recursive: bool = True,
+                 similar_distance: int = SIMILAR_HASH_DISTANCE):
         super().__init__()
         self.folder_path = folder_path
-        self.blur_threshold = blur_threshold
-        self.recursive = recursive
+        self.blur_threshold = float(blur_threshold)
+        self.recursive = bool(recursive)
+        self.similar_distance = int(similar_distance)
         self.db = DBManager()
-        self._is_running = True
+        self._stop = threading.Event()  # 協調的キャンセル (ファイルごとに確認)
+        self._last_progress = 0.0
+        self._last_progress_count = 0
+        self._current_path = ""  # 最後に進捗を記録したファイル (GUIが表示時に参照)
+        self.max_workers = os.cpu_count() or 1
         
-        self.face_cascade = cv2.CascadeClassifier(FACE_CASCADE_PATH)
+        # 顔検出器はスレッドセーフではないためスレッドごとに保持
+        self._thread_local = threading.local()
+        self.use_yunet = hasattr(cv2, "FaceDetectorYN") and os.path.exists(FACE_YUNET_PATH)
+        
+        # スキャン中の顔検出結果キャッシュ (LRU)
+        self._face_cache = OrderedDict()  # pHash先頭40bit -> 顔数
+        self._face_cache_lock = threading.Lock()
 
     def stop(self):
-        self._is_running = False
+        """中断を要求 (待たずに戻る。実行中のファイルの解析後にループを抜ける)"""
+        self._stop.set()
+
+    def current_name(self) -> str:
+        """
+        処理中のファイル名 (GUIの表示更新時にだけ呼ばれる)
+        参照の代入・読み出しのみなのでロックは不要
+        """
+        return os.path.basename(self._current_path)
+
+    def _emit_progress(self, current: int, total: int, file_path: str):
+        """
+        進捗を通知 (PROGRESS_INTERVAL かつ総数の0.1%ごとに間引き、最後の1件は必ず送る)
+        GUIスレッドにキューイングされるイベント数を抑える
+        total=0 はファイル列挙中 (総数未確定、current は見つかった件数)
+        ファイル名はシグナルに載せず、ワーカー側に保持して current_name() で渡す
+        """
+        self._current_path = file_path
+        if current != total:
+            # 1スキャンあたり最大約1000回 (総数の0.1%ごと) に抑える
+            if total and current - self._last_progress_count < total // 1000:
+                return
+            now = time.monotonic()
+            if now - self._last_progress < PROGRESS_INTERVAL:
+                return
+            self._last_progress = now
+        if total:
+            self._last_progress_count = current
+        self.progress.emit(current, total)
+
+    @property
+    def face_detector(self):
+        """
+        呼び出し元スレッド専用の顔検出器
+        YuNet (cv2.FaceDetectorYN) が使えればそれを、なければ Haar カスケードを返す
+        """
+        detector = getattr(self._thread_local, "face_detector", None)
+        if detector is None:
+            if self.use_yunet:
+                try:
+                    detector = cv2.FaceDetectorYN.create(
+                        FACE_YUNET_PATH, "", (320, 320), 0.6, 0.3, 5000
+                    )
+                except cv2.error:
+                    self.use_yunet = False
+            if detector is None:
+                detector = cv2.CascadeClassifier(FACE_CASCADE_PATH)
+            self._thread_local.face_detector = detector
+        return detector
 
     def run(self):
+        """
+        スキャン処理 (例外が起きても finished は必ず発行する)
+        GUI側は finished を受けて次のスキャンを受け付けるため、途中で止まると再スキャンできなくなる
+        """
+        try:
+            self._run()
+        except Exception as e:
+            self.log.emit(f"スキャンエラー: {str(e)}")
+            self.finished.emit(_new_results(self.similar_distance), {"scanned": 0, "blur": 0, "sim_groups": 0, "dup_videos": 0})
+
+    def _run(self):
         """スキャン処理のメインループ"""
         self.log.emit("スキャンを開始します...")
         
+        # 列挙中も件数を通知し、総数が確定するまで画面が止まって見えないようにする
         files_to_scan = []
-        
-        if self.recursive:
-            for root, dirs, files in os.walk(self.folder_path):
-                dirs[:] = [d for d in dirs if d not in EXCLUDED_DIRS]
-                for file in files:
-                    ext = os.path.splitext(file)[1].lower()
-                    if ext in IMAGE_EXTENSIONS or ext in VIDEO_EXTENSIONS:
-                        files_to_scan.append(os.path.join(root, file))
-        else:
-            for file in os.listdir(self.folder_path):
-                filepath = os.path.join(self.folder_path, file)
-                if os.path.isfile(filepath):
-                    ext = os.path.splitext(file)[1].lower()
-                    if ext in IMAGE_EXTENSIONS or ext in VIDEO_EXTENSIONS:
-                        files_to_scan.append(filepath)
+        for entry in _iter_media_files(self.folder_path, self.recursive):
+            if self._stop.is_set():
+                break
+            files_to_scan.append(entry)
+            self._emit_progress(len(files_to_scan), 0, entry[0])
 
         total_files = len(files_to_scan)
         self.log.emit(f"対象ファイル数: {total_files}")
         
-        results = {
-            "scanned_count": 0,
-            "blur_images": [],
-            "similar_groups": {},
-            "duplicate_videos": {},
-            "image_metadata": {},
-            "corrupted_files": []  # 破損ファイルリスト: [(path, error_message), ...]
-        }
+        results = _new_results(self.similar_distance)
 
-        phash_map: Dict[str, List[Tuple[str, float, int, int]]] = {}
-        video_content_map: Dict[Tuple[int, str], List[Tuple[str, float]]] = {}
+        shots = _ShotArrays(total_files)
+        phash_map: Dict[int, List[int]] = {}  # pHash -> shots のインデックス
+        video_content_map: Dict[int, List[Tuple[str, float]]] = {}  # 秒数 << 64 | フレームpHash
 
         processed_count = 0
         
-        for file_path in files_to_scan:
-            if not self._is_running:
-                break
+        # キャッシュは1回の SELECT でまとめて読み込み、ファイルごとの問い合わせを避ける
+        cache_map = self.db.load_all()
+        
+        # DB書き込みは専用スレッドに任せ、スキャン側は fsync を待たない
+        write_queue = queue.Queue(maxsize=1000)
+        writer = self.db.start_writer(write_queue)
+        
+        # 画像/動画の解析はファイル間で独立しているためスレッドプールで並列化
+        # (OpenCV/PIL のデコード・フィルタ処理は GIL を解放する)
+        # ファイル単位で全コアを使うため、OpenCV 内部のスレッド並列は止めて過剰なスレッド生成を防ぐ
+        cv_threads = cv2.getNumThreads()
+        cv2.setNumThreads(1)
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                futures = {}
+            
+                for file_path, stat in files_to_scan:
+                    if self._stop.is_set():
+                        break
 
-            processed_count += 1
-            self.progress.emit(processed_count, total_files, os.path.basename(file_path))
+                    mtime = stat.st_mtime
+                    size = stat.st_size
+                    # 更新日時/サイズが一致する場合のみキャッシュを使う
+                    cached_data = cache_map.get(file_path)
+                
+                    if (cached_data is not None and cached_data['file_size'] == size
+                            and abs(cached_data['last_modified'] - mtime) < 0.001):
+                        processed_count += 1
+                        self._emit_progress(processed_count, total_files, file_path)
+                        self._collect_result(results, shots, phash_map, video_content_map,
+                                             file_path, mtime, size, cached_data)
+                    else:
+                        future = executor.submit(self._analyze_file, file_path, size)
+                        futures[future] = (file_path, mtime, size)
+            
+                for future in as_completed(futures):
+                    if self._stop.is_set():
+                        executor.shutdown(wait=True, cancel_futures=True)
+                        break
 
-            try:
-                stat = os.stat(file_path)
-                mtime = stat.st_mtime
-                size = stat.st_size
+                    file_path, mtime, size = futures[future]
+                    processed_count += 1
+                    self._emit_progress(processed_count, total_files, file_path)
 
-                cached_data = self.db.get_cache(file_path)
-                
-                if self.db.is_cache_valid(file_path, mtime, size):
-                    phash = cached_data.get('phash')
-                    blur_score = cached_data.get('blur_score')
-                    face_count = cached_data.get('face_count')
-                    video_duration = cached_data.get('video_duration')
-                    video_frame_hash = cached_data.get('video_frame_hash')
-                else:
-                    phash = None
-                    video_hash = None
-                    blur_score = None
-                    face_count = None
-                    video_duration = None
-                    video_frame_hash = None
-                    
-                    if file_path.lower().endswith(tuple(IMAGE_EXTENSIONS)):
-                        # 画像の破損チェック
-                        is_corrupted, error_msg = self._check_image_corrupted(file_path)
-                        if is_corrupted:
-                            results["corrupted_files"].append((file_path, error_msg))
-                            self.log.emit(f"破損ファイル検出: {os.path.basename(file_path)} - {error_msg}")
-                            continue
-                        blur_score = self._calculate_blur_score(file_path)
-                        phash = self._calculate_phash(file_path)
-                        face_count = self._detect_faces(file_path)
-                    elif file_path.lower().endswith(tuple(VIDEO_EXTENSIONS)):
-                        # 動画の破損チェック
-                        is_corrupted, error_msg = self._check_video_corrupted(file_path)
-                        if is_corrupted:
-                            results["corrupted_files"].append((file_path, error_msg))
-                            self.log.emit(f"破損ファイル検出: {os.path.basename(file_path)} - {error_msg}")
-                            continue
-                        video_hash = self._calculate_video_hash(file_path, size)
-                        video_duration, video_frame_hash = self._analyze_video_content(file_path)
-
-                    self.db.upsert_cache(file_path, mtime, size, blur_score, phash, video_hash,
-                                         face_count, video_duration, video_frame_hash)
-
-                if blur_score is not None:
-                    results["image_metadata"][file_path] = {
-                        "blur_score": blur_score,
-                        "face_count": face_count or 0,
-                        "size": size
-                    }
-                    if blur_score < self.blur_threshold:
-                        results["blur_images"].append((file_path, blur_score, face_count or 0))
-                
-                if phash:
-                    if phash not in phash_map:
-                        phash_map[phash] = []
-                    phash_map[phash].append((file_path, blur_score or 0, face_count or 0, size))
+                    try:
+                        data = future.result()
+                    except Exception as e:
+                        self.log.emit(f"エラー ({os.path.basename(file_path)}): {str(e)}")
+                        continue
                 
-                if video_duration is not None and video_frame_hash:
-                    duration_bucket = int(video_duration)
-                    key = (duration_bucket, video_frame_hash)
-                    if key not in video_content_map:
-                        video_content_map[key] = []
-                    video_content_map[key].append((file_path, video_duration))
+                    if data["error"]:
+                        results["corrupted_files"].append((file_path, data["error"]))
+                        self.log.emit(f"破損ファイル検出: {os.path.basename(file_path)} - {data['error']}")
+                        continue
 
-            except Exception as e:
-                self.log.emit(f"エラー ({os.path.basename(file_path)}): {str(e)}")
+                    write_queue.put((file_path, mtime, size, data["blur_score"], data["phash"],
+                                     data["video_hash"], data["face_count"],
+                                     data["video_duration"], data["video_frame_hash"]))
+
+                    self._collect_result(results, shots, phash_map, video_content_map,
+                                         file_path, mtime, size, data)
+        finally:
+            # 途中で例外が起きても OpenCV の設定 (プロセス全体) を戻し、書き込みスレッドを終了させる
+            cv2.setNumThreads(cv_threads)
+            write_queue.put(None)
+            writer.join()
+            self.db.close()
         
-        for k, v in phash_map.items():
-            if len(v) > 1:
-                results["similar_groups"][k] = v
+        # ハミング距離 similar_distance 以内の pHash を1グループにまとめる
+        # (ハミング距離は符号なしで計算する)
+        hash_keys = {k & PHASH_MASK: k for k in phash_map}
+        for cluster in group_hashes(hash_keys, self.similar_distance):
+            ids = [i for h in cluster for i in phash_map[hash_keys[h]]]
+            if len(ids) > 1:
+                results["similar_groups"][f"{cluster[0]:016x}"] = shots.items(ids)
         
         for key, v in video_content_map.items():
             if len(v) > 1:
-                group_key = f"duration_{key[0]}s_{key[1][:8]}"
+                # 秒数と pHash の先頭32bit (16進8桁) をグループ名に使う
+                group_key = f"duration_{key >> 64}s_{(key >> 32) & 0xFFFFFFFF:08x}"
                 results["duplicate_videos"][group_key] = v
         
         results["scanned_count"] = processed_count
-        self.db.close()
-        self.finished.emit(results)
+        
+        # 件数はここで一度だけ数え、GUI側では数え直さない
+        summary = {
+            "scanned": processed_count,
+            "blur": len(results["blur_images"]),
+            "sim_groups": len(results["similar_groups"]),
+            "dup_videos": len(results["duplicate_videos"]),
+        }
+        self.finished.emit(results, summary)
+
+    def _collect_result(self, results: dict, shots: _ShotArrays, phash_map: dict,
+                        video_content_map: dict,
+                        file_path: str, mtime: float, size: int, data) -> None:
+        """
+        1ファイル分の解析結果を集計に反映
+        data はキャッシュ行 (sqlite3.Row) または _analyze_file の結果 (dict)
+        """
+        blur_score = data['blur_score']
+        phash = data['phash']
+        face_count = data['face_count']
+        video_duration = data['video_duration']
+        video_frame_hash = data['video_frame_hash']
+
+        if blur_score is not None:
+            results["image_metadata"][file_path] = {
+                "blur_score": blur_score,
+                "face_count": face_count or 0,
+                "size": size,
+                "mtime": mtime,  # サムネイルのメモリキャッシュのキー (表示側で stat しない)
+                "phash": phash  # 符号付き64bit (閾値変更時の再グルーピング用)
+            }
+            if blur_score < self.blur_threshold:
+                results["blur_images"].append((file_path, blur_score, face_count or 0))
+        
+        if phash is not None:
+            if phash not in phash_map:
+                phash_map[phash] = []
+            phash_map[phash].append(shots.append(file_path, blur_score or 0, face_count or 0, size))
+        
+        if video_duration is not None and video_frame_hash is not None:
+            # 秒数とフレームの pHash (符号なし) を1つの整数キーにまとめる
+            key = (int(video_duration) << 64) | (video_frame_hash & PHASH_MASK)
+            if key not in video_content_map:
+                video_content_map[key] = []
+            video_content_map[key].append((file_path, video_duration))
 
-    def _calculate_blur_score(self, image_path: str) -> float:
+    def _analyze_file(self, file_path: str, size: int) -> Dict:
+        """
+        1ファイルを解析 (ワーカースレッドで実行)
+        Returns: キャッシュ列と同じキーの dict。破損時は "error" にメッセージ
+        """
+        data = {
+            "error": "",
+            "blur_score": None,
+            "phash": None,
+            "video_hash": None,
+            "face_count": None,
+            "video_duration": None,
+            "video_frame_hash": None
+        }
+        
+        lower_path = file_path.lower()
+        if lower_path.endswith(_IMAGE_EXT_TUPLE):
+            (data["error"], data["blur_score"],
+             data["phash"], data["face_count"]) = self._process_image(file_path)
+        elif lower_path.endswith(_VIDEO_EXT_TUPLE):
+            # 動画の破損チェック
+            is_corrupted, error_msg = self._check_video_corrupted(file_path)
+            if is_corrupted:
+                data["error"] = error_msg
+                return data
+            data["video_hash"] = self._calculate_video_hash(file_path, size)
+            data["video_duration"], data["video_frame_hash"] = self._analyze_video_content(file_path)
+        
+        return data
+
+    def _process_image(self, image_path: str) -> Tuple[str, Optional[float], Optional[int], Optional[int]]:
+        """
+        画像を1回だけ読み込み・デコードし、破損チェック/ブレ/pHash/顔検出で共用する
+        Returns: (error_message, blur_score, phash, face_count) - 破損時は error_message のみ
+        """
         try:
-            img = self._load_image_cv2(image_path, grayscale=True)
-            if img is None:
-                return 1000.0
-            return cv2.Laplacian(img, cv2.CV_64F).var()
+            with open(image_path, "rb") as stream:
+                raw = stream.read()
+        except Exception as e:
+            return f"画像読み込みエラー: {str(e)[:50]}", None, None, None
+        
+        img = self._decode_image_cv2(raw, grayscale=True)
+        
+        # 画像の破損チェック
+        is_corrupted, error_msg = self._check_image_corrupted(raw, img)
+        if is_corrupted:
+            return error_msg, None, None, None
+        
+        # ブレは原寸の中央部分で判定 (スコアは画像全体を原寸で計算した値とほぼ同じ尺度)
+        blur_score = self._calculate_blur_score(_center_crop(img, BLUR_CROP_SIZE))
+        
+        # 長辺 ANALYSIS_MAX_EDGE に縮小した画像を pHash/顔検出で共用
+        height, width = img.shape[:2]
+        if max(height, width) > ANALYSIS_MAX_EDGE:
+            scale = ANALYSIS_MAX_EDGE / max(height, width)
+            img = cv2.resize(img, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+        
+        phash = self._calculate_phash(img)
+        return "", blur_score, phash, self._detect_faces_cached(img, phash)
+
+    def _detect_faces_cached(self, gray: np.ndarray, phash: Optional[int]) -> int:
+        """
+        pHash 上位40bitが同じ画像 (連写・ブラケット等) は顔数も同じとみなして検出を省略
+        顔数はベストショット選択のタイブレークにのみ使うため多少の誤差は許容する
+        """
+        if phash is None:
+            return self._detect_faces(gray)
+        
+        key = phash >> (64 - FACE_CACHE_PREFIX_BITS)
+        with self._face_cache_lock:
+            face_count = self._face_cache.get(key)
+            if face_count is not None:
+                self._face_cache.move_to_end(key)
+                return face_count
+        
+        face_count = self._detect_faces(gray)
+        with self._face_cache_lock:
+            self._face_cache[key] = face_count
+            if len(self._face_cache) > FACE_CACHE_SIZE:
+                self._face_cache.popitem(last=False)
+        return face_count
+
+    def _calculate_blur_score(self, gray: np.ndarray) -> float:
+        """原寸のグレースケール画像 (中央部分) のラプラシアン分散"""
+        try:
+            return float(_laplacian_variance(gray))
         except Exception:
             return 1000.0
 
-    def _calculate_phash(self, image_path: str) -> str:
+    def _calculate_phash(self, gray: np.ndarray) -> Optional[int]:
+        """縮小済みグレースケール画像の pHash"""
         try:
-            img = Image.open(image_path)
-            return str(imagehash.phash(img))
+            return _phash_gray(gray)
         except Exception:
-            return ""
+            return None
 
-    def _detect_faces(self, image_path: str) -> int:
+    def _detect_faces(self, gray: np.ndarray) -> int:
+        """縮小済みグレースケール画像の顔検出数"""
         try:
-            img = self._load_image_cv2(image_path, grayscale=True)
-            if img is None:
-                return 0
-            
+            img = gray
             height, width = img.shape[:2]
             if width > 480:
                 scale = 480 / width
                 img = cv2.resize(img, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
             
-            faces = self.face_cascade.detectMultiScale(
-                img, scaleFactor=1.1, minNeighbors=5, minSize=(30, 30)
-            )
-            return len(faces)
+            detector = self.face_detector
+            if isinstance(detector, cv2.CascadeClassifier):
+                faces = detector.detectMultiScale(
+                    img, scaleFactor=1.1, minNeighbors=5, minSize=(30, 30)
+                )
+                return len(faces)
+            
+            # YuNet は BGR 3チャンネル入力
+            height, width = img.shape[:2]
+            detector.setInputSize((width, height))
+            _, faces = detector.detect(cv2.cvtColor(img, cv2.COLOR_GRAY2BGR))
+            return 0 if faces is None else len(faces)
         except Exception:
             return 0
 
     def _calculate_video_hash(self, video_path: str, file_size: int) -> str:
+        """ファイルサイズ + 先頭/末尾 64KB の XXH3 (64bit) ハッシュ (同一性判定用で暗号強度は不要)"""
         try:
             chunk_size = 64 * 1024
-            hasher = hashlib.md5()
-            hasher.update(str(file_size).encode('utf-8'))
+            hasher = xxhash.xxh3_64()
+            hasher.update(file_size.to_bytes(8, 'little'))
             with open(video_path, 'rb') as f:
-                buf = f.read(chunk_size)
-                hasher.update(buf)
+                if file_size <= chunk_size * 2:
+                    # 小さいファイルは全体をハッシュ
+                    hasher.update(f.read())
+                else:
+                    hasher.update(f.read(chunk_size))
+                    f.seek(-chunk_size, os.SEEK_END)
+                    hasher.update(f.read(chunk_size))
             return hasher.hexdigest()
         except Exception:
             return str(file_size)
 
-    def _analyze_video_content(self, video_path: str) -> Tuple[Optional[float], Optional[str]]:
+    def _open_video(self, video_path: str) -> cv2.VideoCapture:
+        """FFmpeg バックエンドでハードウェアデコードを要求して開く (失敗時は既定設定)"""
+        if hasattr(cv2, "CAP_PROP_HW_ACCELERATION"):
+            cap = cv2.VideoCapture(video_path, cv2.CAP_FFMPEG, [
+                cv2.CAP_PROP_HW_ACCELERATION, cv2.VIDEO_ACCELERATION_ANY,
+                cv2.CAP_PROP_HW_DEVICE, 0
+            ])
+            if cap.isOpened():
+                return cap
+            cap.release()
+        return cv2.VideoCapture(video_path)
+
+    def _analyze_video_content(self, video_path: str) -> Tuple[Optional[float], Optional[int]]:
         try:
-            cap = cv2.VideoCapture(video_path)
+            cap = self._open_video(video_path)
             if not cap.isOpened():
                 return None, None
             
@@ -228,38 +581,44 @@ class ScanWorker(QObject):
                 return None, None
             
             duration = frame_count / fps
-            middle_frame_idx = int(frame_count / 2)
-            cap.set(cv2.CAP_PROP_POS_FRAMES, middle_frame_idx)
+            # 中間地点へ時刻指定でシーク (キーフレーム単位で移動できる)
+            cap.set(cv2.CAP_PROP_POS_MSEC, duration * 500)
             ret, frame = cap.read()
             cap.release()
             
             if not ret or frame is None:
-                return duration, None
+                # HWデコード/時刻シークに失敗した場合は従来のフレーム番号指定で再試行
+                cap = cv2.VideoCapture(video_path)
+                cap.set(cv2.CAP_PROP_POS_FRAMES, int(frame_count / 2))
+                ret, frame = cap.read()
+                cap.release()
             
-            frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            pil_image = Image.fromarray(frame_rgb)
-            frame_hash = str(imagehash.phash(pil_image))
+            if not ret or frame is None:
+                return duration, None
             
-            return duration, frame_hash
+            return duration, _phash_gray(cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY))
         except Exception:
             return None, None
 
-    def _check_image_corrupted(self, image_path: str) -> Tuple[bool, str]:
+    def _check_image_corrupted(self, raw: bytes, img: Optional[np.ndarray]) -> Tuple[bool, str]:
         """
         画像ファイルが破損しているかチェック
+        raw: ファイルの内容, img: raw を OpenCV でデコードした結果
         Returns: (is_corrupted, error_message)
         """
         try:
-            # OpenCVで読み込みテスト - これが失敗すると致命的
-            img = self._load_image_cv2(image_path)
+            # OpenCVでのデコード結果 - これが失敗すると致命的
             if img is None:
                 return True, "画像データの読み込みに失敗 (Invalid image data)"
             
             # PILでも読み込みテスト (JPEG SOS エラー等を検出)
             # ただし、実際に読み込めた場合は警告のみ
             try:
-                with Image.open(image_path) as pil_img:
+                with Image.open(io.BytesIO(raw)) as pil_img:
                     # verify()ではなくload()で実際に読み込む
+                    # 画素は OpenCV 側のデコード結果を使うので、JPEG は 1/8 縮小・グレーで
+                    # デコードさせる (符号化データは全て読むため破損検出は変わらない)
+                    pil_img.draft("L", (1, 1))
                     pil_img.load()
             except Exception as e:
                 error_str = str(e)
@@ -302,25 +661,34 @@ class ScanWorker(QObject):
         except Exception as e:
             return True, f"動画読み込みエラー: {str(e)[:50]}"
 
-    def _load_image_cv2(self, image_path: str, grayscale: bool = False) -> Optional[np.ndarray]:
+    def _decode_image_cv2(self, raw: bytes, grayscale: bool = False) -> Optional[np.ndarray]:
         try:
-            with open(image_path, "rb") as stream:
-                bytes_data = bytearray(stream.read())
-            numpyarray = np.asarray(bytes_data, dtype=np.uint8)
+            numpyarray = np.frombuffer(raw, dtype=np.uint8)
             flag = cv2.IMREAD_GRAYSCALE if grayscale else cv2.IMREAD_COLOR
             img = cv2.imdecode(numpyarray, flag)
             return img
         except Exception:
             return None
 
+class ScanRunnable(QRunnable):
+    """
+    ScanWorker.run を QThreadPool 上で実行するラッパー
+    QRunnable は QObject ではないため、シグナルは ScanWorker のものをそのまま使う
+    """
+
+    def __init__(self, worker: ScanWorker):
+        super().__init__()
+        self.worker = worker
+
+    def run(self):
+        self.worker.run()
+
 
 def select_best_shot(group_items: List[Tuple[str, float, int, int]]) -> str:
     """類似画像グループから「残すべき1枚」を選択する"""
     if not group_items:
         return ""
-    sorted_items = sorted(
-        group_items,
-        key=lambda x: (x[2], x[1], x[3]),
-        reverse=True
-    )
-    return sorted_items[0][0]
+    # 顔の数 > ブレスコア > サイズ の順で比較 (lexsort は最後のキーが最優先、同点は先頭を優先)
+    _, blur, faces, size = zip(*group_items)
+    order = np.lexsort((-np.arange(len(group_items)), size, blur, faces))
+    return group_items[order[-1]][0]
@@ -0,0 +1,229 @@
+"""
+similarity.py - SmartMediaCleaner
+pHash のハミング距離による類似画像グルーピング
+"""
+from typing import Dict, Iterable, List
+
+import numpy as np
+
+try:
+    from numba import njit  # 任意依存: 再グルーピングの高速化
+except ImportError:
+    njit = None
+
+# NumPy 版で距離をまとめて計算する1ブロックの作業領域の上限 (uint64 の XOR 結果のバイト数)
+PAIRWISE_BLOCK_BYTES = 20 * 1024 * 1024
+# 候補の絞り込みに使う上位ビット数 (このビット同士の距離が閾値を超える組は比較しない)
+PREFIX_BITS = 16
+# 絞り込みを行う閾値の上限 (16bit 中 5bit 以内の組は全体の約1割)
+PREFIX_MAX_DISTANCE = 5
+
+
+if hasattr(int, "bit_count"):
+    def hamming_distance(a: int, b: int) -> int:
+        """64bit pHash 同士のハミング距離"""
+        return (a ^ b).bit_count()
+else:  # Python 3.9 以前
+    def hamming_distance(a: int, b: int) -> int:
+        """64bit pHash 同士のハミング距離"""
+        return bin(a ^ b).count("1")
+
+
+if hasattr(np, "bitwise_count"):
+    def popcount64(values: np.ndarray) -> np.ndarray:
+        """uint64 配列の要素ごとの立っているビット数"""
+        return np.bitwise_count(values)
+else:  # NumPy 2.0 未満はバイト単位の表引き
+    _POPCOUNT8 = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+    def popcount64(values: np.ndarray) -> np.ndarray:
+        """uint64 配列の要素ごとの立っているビット数"""
+        values = np.ascontiguousarray(values, dtype=np.uint64)
+        return _POPCOUNT8[values.view(np.uint8)].reshape(values.shape + (8,)).sum(axis=-1, dtype=np.uint8)
+
+
+class BKTree:
+    """
+    ハミング距離用の BK-tree
+    三角不等式で枝刈りし、半径内の近傍ハッシュを高速に検索する
+    """
+
+    def __init__(self):
+        self._root = None  # [value, {distance: child_node}]
+
+    def add(self, value: int):
+        node = self._root
+        if node is None:
+            self._root = [value, {}]
+            return
+        while True:
+            dist = hamming_distance(value, node[0])
+            if dist == 0:
+                return  # 同じ値は登録済み
+            child = node[1].get(dist)
+            if child is None:
+                node[1][dist] = [value, {}]
+                return
+            node = child
+
+    def find(self, value: int, max_distance: int) -> List[int]:
+        """value から max_distance 以内の登録値を返す"""
+        found = []
+        if self._root is None:
+            return found
+        stack = [self._root]
+        while stack:
+            node_value, children = stack.pop()
+            dist = hamming_distance(value, node_value)
+            if dist <= max_distance:
+                found.append(node_value)
+            low, high = dist - max_distance, dist + max_distance
+            for child_dist, child in children.items():
+                if low <= child_dist <= high:
+                    stack.append(child)
+        return found
+
+
+def group_hashes(hashes: Iterable[int], max_distance: int) -> List[List[int]]:
+    """
+    ハミング距離 max_distance 以内のハッシュを推移的にまとめる (Union-Find)
+    Returns: クラスタのリスト (要素数1のクラスタも含む)
+    """
+    unique = list(dict.fromkeys(hashes))
+    parent: Dict[int, int] = {h: h for h in unique}
+
+    def find_root(h: int) -> int:
+        while parent[h] != h:
+            parent[h] = parent[parent[h]]
+            h = parent[h]
+        return h
+
+    if max_distance > 0:
+        tree = BKTree()
+        for h in unique:
+            tree.add(h)
+        for h in unique:
+            root = find_root(h)
+            for neighbor in tree.find(h, max_distance):
+                other = find_root(neighbor)
+                if other != root:
+                    parent[other] = root
+
+    clusters: Dict[int, List[int]] = {}
+    for h in unique:
+        clusters.setdefault(find_root(h), []).append(h)
+    return list(clusters.values())
+
+
+if njit is not None:
+    _M1 = np.uint64(0x5555555555555555)
+    _M2 = np.uint64(0x3333333333333333)
+    _M4 = np.uint64(0x0F0F0F0F0F0F0F0F)
+    _H01 = np.uint64(0x0101010101010101)
+
+    @njit(cache=True, nogil=True)
+    def _popcount_u64(x):
+        """SWAR によるビット数の計算 (numba 内から呼ぶ)"""
+        x = x - ((x >> np.uint64(1)) & _M1)
+        x = (x & _M2) + ((x >> np.uint64(2)) & _M2)
+        x = (x + (x >> np.uint64(4))) & _M4
+        return (x * _H01) >> np.uint64(56)
+
+    @njit(cache=True, nogil=True)
+    def _find_root(parent, i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    @njit(cache=True, nogil=True)
+    def _cluster_roots(unique, max_distance):
+        """
+        全ペアを距離行列を作らずに走査し、閾値以内なら Union-Find で結合
+        unique は昇順なので上位 PREFIX_BITS ビットが同じ要素は連続する (バケット)。
+        バケットの先頭ビット同士の距離が閾値を超える組は中身を比較せずに飛ばす
+        Returns: 各要素の根のインデックス
+        """
+        n = unique.shape[0]
+        parent = np.arange(n)
+
+        # バケットの先頭ビットと開始位置
+        # 閾値が大きいと飛ばせる組がほとんどないため、全体を1バケットとして扱う
+        use_prefix = max_distance <= PREFIX_MAX_DISTANCE
+        shift = np.uint64(64 - PREFIX_BITS)
+        bucket_prefix = np.empty(n, dtype=np.uint64)
+        bucket_start = np.empty(n + 1, dtype=np.int64)
+        n_buckets = 0
+        for i in range(n):
+            prefix = unique[i] >> shift if use_prefix else np.uint64(0)
+            if n_buckets == 0 or prefix != bucket_prefix[n_buckets - 1]:
+                bucket_prefix[n_buckets] = prefix
+                bucket_start[n_buckets] = i
+                n_buckets += 1
+        bucket_start[n_buckets] = n
+
+        for bp in range(n_buckets):
+            for bq in range(bp, n_buckets):
+                if _popcount_u64(bucket_prefix[bp] ^ bucket_prefix[bq]) > max_distance:
+                    continue
+                for i in range(bucket_start[bp], bucket_start[bp + 1]):
+                    a = unique[i]
+                    j_start = i + 1 if bq == bp else bucket_start[bq]
+                    for j in range(j_start, bucket_start[bq + 1]):
+                        if _popcount_u64(a ^ unique[j]) <= max_distance:
+                            root_i = _find_root(parent, i)
+                            root_j = _find_root(parent, j)
+                            if root_i != root_j:
+                                parent[root_j] = root_i
+        for i in range(n):
+            parent[i] = _find_root(parent, i)
+        return parent
+
+
+def _cluster_roots_numpy(unique: np.ndarray, max_distance: int) -> np.ndarray:
+    """
+    距離をブロック単位で一括計算し、閾値以内のペアを Union-Find で結合 (numba がない場合)
+    各ブロックは自分以降の列 (上三角) とだけ比較し、行数は件数に応じて PAIRWISE_BLOCK_BYTES に収める
+    Returns: 各要素の根のインデックス
+    """
+    n = len(unique)
+    parent = list(range(n))
+
+    def find_root(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    block_rows = max(1, PAIRWISE_BLOCK_BYTES // (max(n, 1) * 8))
+    for start in range(0, n, block_rows):
+        block = unique[start:start + block_rows]
+        # 列 start 以降とだけ比較し、対角より右 (列 > 行) のみを対象にする
+        near = np.triu(popcount64(block[:, None] ^ unique[None, start:]) <= max_distance, k=1)
+        rows, cols = np.nonzero(near)
+        for a, b in zip((rows + start).tolist(), (cols + start).tolist()):
+            root_a, root_b = find_root(a), find_root(b)
+            if root_a != root_b:
+                parent[root_b] = root_a
+
+    return np.array([find_root(i) for i in range(n)], dtype=np.intp)
+
+
+if njit is None:
+    _cluster_roots = _cluster_roots_numpy
+
+
+def cluster_hash_array(hashes: np.ndarray, max_distance: int) -> List[np.ndarray]:
+    """
+    uint64 の pHash 配列をハミング距離 max_distance 以内で推移的にまとめる
+    numba があれば JIT 化したカーネルで、なければ NumPy の一括計算で全ペアを比較する
+    Returns: 要素数2以上のクラスタ (hashes のインデックス配列, 昇順) を先頭インデックス順に
+    """
+    # 同一ハッシュは1つにまとめてから比較する
+    unique, inverse = np.unique(hashes, return_inverse=True)
+    labels = _cluster_roots(unique, max_distance)[inverse.ravel()]
+    order = np.argsort(labels, kind="stable")
+    splits = np.flatnonzero(np.diff(labels[order])) + 1
+    clusters = [c for c in np.split(order, splits) if len(c) > 1]
+    clusters.sort(key=lambda c: c[0])
+    return clusters
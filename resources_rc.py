@@ -0,0 +1,292 @@
+# Resource object code (Python 3)
+# Created by: object code
+# Created by: The Resource Compiler for Qt version 6.12.0
+# WARNING! All changes made in this file will be lost!
+
+from PySide6 import QtCore
+
+qt_resource_data = b"\
+\x00\x00\x10/\
+Q\
+MainWindow,QWidg\
+et{background-co\
+lor:#1a1a1a;colo\
+r:#e8e8e8;font-f\
+amily:'Segoe UI'\
+,'Yu Gothic UI',\
+sans-serif;font-\
+size:13px;}QPush\
+Button{backgroun\
+d-color:#2d2d2d;\
+border:1px solid\
+ #404040;padding\
+:8px 16px;border\
+-radius:6px;min-\
+height:20px;}QPu\
+shButton:hover{b\
+ackground-color:\
+#3d3d3d;border-c\
+olor:#0078d4;}QP\
+ushButton:presse\
+d{background-col\
+or:#1a1a1a;}QPus\
+hButton:disabled\
+{background-colo\
+r:#252525;color:\
+#666666;border-c\
+olor:#333333;}QP\
+ushButton#primar\
+yBtn,QPushButton\
+[primary=\x22true\x22]\
+{background-colo\
+r:#0078d4;border\
+-color:#0078d4;c\
+olor:white;}QPus\
+hButton#primaryB\
+tn:hover,QPushBu\
+tton[primary=\x22tr\
+ue\x22]:hover{backg\
+round-color:#1a8\
+6d9;}QPushButton\
+#primaryBtn:pres\
+sed,QPushButton[\
+primary=\x22true\x22]:\
+pressed{backgrou\
+nd-color:#006cbd\
+;}QPushButton#da\
+ngerBtn,QPushBut\
+ton[danger=\x22true\
+\x22]{background-co\
+lor:#d41a1a;bord\
+er-color:#d41a1a\
+;color:white;}QP\
+ushButton#danger\
+Btn:hover,QPushB\
+utton[danger=\x22tr\
+ue\x22]:hover{backg\
+round-color:#e62\
+929;}QProgressBa\
+r{border:none;bo\
+rder-radius:4px;\
+background-color\
+:#2d2d2d;text-al\
+ign:center;heigh\
+t:8px;}QProgress\
+Bar::chunk{backg\
+round:qlineargra\
+dient(x1:0,y1:0,\
+x2:1,y2:0,stop:0\
+ #0078d4,stop:1 \
+#00b4d8);border-\
+radius:4px;}QTex\
+tEdit,QPlainText\
+Edit,QLineEdit,Q\
+SpinBox,QDoubleS\
+pinBox{backgroun\
+d-color:#2d2d2d;\
+border:1px solid\
+ #404040;border-\
+radius:6px;paddi\
+ng:6px;selection\
+-background-colo\
+r:#0078d4;}QText\
+Edit:focus,QPlai\
+nTextEdit:focus,\
+QLineEdit:focus,\
+QSpinBox:focus,Q\
+DoubleSpinBox:fo\
+cus{border-color\
+:#0078d4;}QTable\
+Widget{backgroun\
+d-color:#1a1a1a;\
+border:1px solid\
+ #333333;border-\
+radius:8px;gridl\
+ine-color:#33333\
+3;}QTableWidget:\
+:item{padding:8p\
+x;border-bottom:\
+1px solid #2d2d2\
+d;}QTableWidget:\
+:item:selected{b\
+ackground-color:\
+rgba(0,120,212,0\
+.3);}QTableWidge\
+t::item:hover{ba\
+ckground-color:#\
+2d2d2d;}QHeaderV\
+iew::section{bac\
+kground-color:#2\
+52525;border:non\
+e;border-bottom:\
+1px solid #40404\
+0;padding:10px;f\
+ont-weight:bold;\
+}QGroupBox{borde\
+r:1px solid #333\
+333;border-radiu\
+s:8px;margin-top\
+:16px;padding:16\
+px;padding-top:2\
+4px;background-c\
+olor:rgba(45,45,\
+45,0.5);}QGroupB\
+ox::title{subcon\
+trol-origin:marg\
+in;left:12px;pad\
+ding:0 8px;color\
+:#0078d4;font-we\
+ight:bold;}QTabW\
+idget::pane{bord\
+er:1px solid #33\
+3333;border-radi\
+us:8px;backgroun\
+d-color:#1a1a1a;\
+top:-1px;}QTabBa\
+r::tab{backgroun\
+d-color:transpar\
+ent;border:none;\
+padding:12px 24p\
+x;margin-right:4\
+px;border-radius\
+:6px 6px 0 0;col\
+or:#888888;}QTab\
+Bar::tab:hover{b\
+ackground-color:\
+#2d2d2d;color:#e\
+8e8e8;}QTabBar::\
+tab:selected{bac\
+kground-color:#2\
+d2d2d;color:#007\
+8d4;font-weight:\
+bold;}QScrollBar\
+:vertical{backgr\
+ound-color:trans\
+parent;width:12p\
+x;margin:4px;}QS\
+crollBar::handle\
+:vertical{backgr\
+ound-color:#4040\
+40;border-radius\
+:4px;min-height:\
+30px;}QScrollBar\
+::handle:vertica\
+l:hover{backgrou\
+nd-color:#505050\
+;}QScrollBar::ad\
+d-line:vertical,\
+QScrollBar::sub-\
+line:vertical{he\
+ight:0;}QScrollB\
+ar:horizontal{ba\
+ckground-color:t\
+ransparent;heigh\
+t:12px;margin:4p\
+x;}QScrollBar::h\
+andle:horizontal\
+{background-colo\
+r:#404040;border\
+-radius:4px;min-\
+width:30px;}QScr\
+ollBar::handle:h\
+orizontal:hover{\
+background-color\
+:#505050;}QScrol\
+lBar::add-line:h\
+orizontal,QScrol\
+lBar::sub-line:h\
+orizontal{width:\
+0;}QScrollArea{b\
+order:none;backg\
+round-color:tran\
+sparent;}QCheckB\
+ox{spacing:8px;}\
+QCheckBox::indic\
+ator{width:18px;\
+height:18px;bord\
+er-radius:4px;bo\
+rder:2px solid #\
+555555;backgroun\
+d-color:#2d2d2d;\
+}QCheckBox::indi\
+cator:hover{bord\
+er-color:#0078d4\
+;}QCheckBox::ind\
+icator:checked{b\
+ackground-color:\
+#0078d4;border-c\
+olor:#0078d4;}QS\
+lider::groove:ho\
+rizontal{height:\
+6px;background-c\
+olor:#333333;bor\
+der-radius:3px;}\
+QSlider::handle:\
+horizontal{backg\
+round-color:#007\
+8d4;width:18px;h\
+eight:18px;margi\
+n:-6px 0;border-\
+radius:9px;}QSli\
+der::handle:hori\
+zontal:hover{bac\
+kground-color:#1\
+a86d9;}QSlider::\
+sub-page:horizon\
+tal{background-c\
+olor:#0078d4;bor\
+der-radius:3px;}\
+QLabel{color:#e8\
+e8e8;}QLabel[hea\
+ding=\x22true\x22]{fon\
+t-size:18px;font\
+-weight:bold;col\
+or:#ffffff;}QLab\
+el[subtext=\x22true\
+\x22]{font-size:11p\
+x;color:#888888;\
+}QFrame{border-r\
+adius:8px;}QFram\
+e#card{backgroun\
+d-color:#2d2d2d;\
+border:1px solid\
+ #333333;border-\
+radius:12px;}QFr\
+ame#card:hover{b\
+order-color:#007\
+8d4;background-c\
+olor:#353535;}QT\
+oolTip{backgroun\
+d-color:#2d2d2d;\
+color:#e8e8e8;bo\
+rder:1px solid #\
+404040;border-ra\
+dius:4px;padding\
+:6px;}QMessageBo\
+x{background-col\
+or:#1a1a1a;}QMes\
+sageBox QLabel{c\
+olor:#e8e8e8;}\
+"
+
+qt_resource_name = b"\
+\x00\x09\
+\x00(\xad#\
+\x00s\
+\x00t\x00y\x00l\x00e\x00.\x00q\x00s\x00s\
+"
+
+qt_resource_struct = b"\
+\x00\x00\x00\x00\x00\x02\x00\x00\x00\x01\x00\x00\x00\x01\
+\x00\x00\x00\x00\x00\x00\x00\x00\
+\x00\x00\x00\x00\x00\x00\x00\x00\x00\x01\x00\x00\x00\x00\
+\x00\x00\x01\xa1A\x94Y\x9a\
+"
+
+def qInitResources():
+    QtCore.qRegisterResourceData(0x03, qt_resource_struct, qt_resource_name, qt_resource_data)
+
+def qCleanupResources():
+    QtCore.qUnregisterResourceData(0x03, qt_resource_struct, qt_resource_name, qt_resource_data)
+
+qInitResources()
@@ -0,0 +1,67 @@
+"""
+test_similarity.py - SmartMediaCleaner
+NumPy 版の再グルーピングが BK-tree 版 (group_hashes) と同じクラスタになることを確認
+"""
+import os
+import sys
+import unittest
+from unittest import mock
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core import similarity
+
+
+def _random_hashes(seed: int, n_base: int = 300, n_near: int = 400) -> np.ndarray:
+    """ランダムなハッシュと、その数ビットだけ違う近傍ハッシュを混ぜる"""
+    rng = np.random.default_rng(seed)
+    base = rng.integers(0, 2 ** 64, size=n_base, dtype=np.uint64)
+    near = base[rng.integers(0, n_base, size=n_near)]
+    for _ in range(3):
+        bits = rng.integers(0, 64, size=n_near).astype(np.uint64)
+        flip = rng.random(n_near) < 0.7
+        near = np.where(flip, near ^ (np.uint64(1) << bits), near)
+    return np.concatenate([base, near])
+
+
+def _partition_numpy(hashes: np.ndarray, max_distance: int) -> set:
+    unique = np.unique(hashes)
+    roots = similarity._cluster_roots_numpy(unique, max_distance)
+    clusters = {}
+    for value, root in zip(unique.tolist(), roots.tolist()):
+        clusters.setdefault(root, set()).add(value)
+    return {frozenset(c) for c in clusters.values()}
+
+
+def _partition_bktree(hashes: np.ndarray, max_distance: int) -> set:
+    return {frozenset(c) for c in similarity.group_hashes(hashes.tolist(), max_distance)}
+
+
+class ClusterRootsNumpyTest(unittest.TestCase):
+
+    def test_matches_group_hashes(self):
+        for seed in range(3):
+            hashes = _random_hashes(seed)
+            for max_distance in (0, 1, 4, 8):
+                with self.subTest(seed=seed, max_distance=max_distance):
+                    self.assertEqual(_partition_numpy(hashes, max_distance),
+                                     _partition_bktree(hashes, max_distance))
+
+    def test_matches_group_hashes_across_blocks(self):
+        # 1ブロック数行になるよう作業領域を絞り、ブロック境界をまたぐ組も結合されることを確認
+        hashes = _random_hashes(10)
+        with mock.patch.object(similarity, "PAIRWISE_BLOCK_BYTES", len(np.unique(hashes)) * 8 * 3):
+            for max_distance in (2, 6):
+                with self.subTest(max_distance=max_distance):
+                    self.assertEqual(_partition_numpy(hashes, max_distance),
+                                     _partition_bktree(hashes, max_distance))
+
+    def test_empty(self):
+        roots = similarity._cluster_roots_numpy(np.array([], dtype=np.uint64), 4)
+        self.assertEqual(len(roots), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,55 @@
+"""
+build_qss.py - SmartMediaCleaner
+resources/style.qss.src を圧縮して resources/style.qss を生成し、Qtリソースを再コンパイルする
+
+使い方: python tools/build_qss.py
+"""
+import os
+import re
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SRC_PATH = os.path.join(ROOT, "resources", "style.qss.src")
+OUT_PATH = os.path.join(ROOT, "resources", "style.qss")
+QRC_PATH = os.path.join(ROOT, "resources.qrc")
+RC_PY_PATH = os.path.join(ROOT, "resources_rc.py")
+
+_COMMENT = re.compile(r"/\*.*?\*/", re.S)
+_SPACE = re.compile(r"\s+")
+_PUNCT_SPACE = re.compile(r"\s*([{};,:])\s*")
+_RULE = re.compile(r"([^{}]+)\{([^{}]*)\}")
+
+
+def minify_qss(qss: str) -> str:
+    """コメントと余分な空白を除去し、Qt の QSS パーサーが読むトークンを減らす"""
+    qss = _COMMENT.sub("", qss)
+    qss = _SPACE.sub(" ", qss)
+    return _PUNCT_SPACE.sub(r"\1", qss).strip()
+
+
+def merge_rules(qss: str) -> str:
+    """
+    本体が同じ連続したルールをカンマ区切りの1ルールにまとめる
+    離れたルール同士は適用順 (カスケード) が変わるためまとめない
+    """
+    merged = []
+    for selector, body in _RULE.findall(qss):
+        if merged and merged[-1][1] == body:
+            merged[-1][0] += "," + selector
+        else:
+            merged.append([selector, body])
+    return "".join(f"{selector}{{{body}}}" for selector, body in merged)
+
+
+def main() -> int:
+    with open(SRC_PATH, encoding="utf-8") as f:
+        qss = merge_rules(minify_qss(f.read()))
+    with open(OUT_PATH, "w", encoding="utf-8", newline="\n") as f:
+        f.write(qss)
+    print(f"{os.path.relpath(OUT_PATH, ROOT)}: {len(qss)} bytes")
+    return subprocess.call(["pyside6-rcc", "--no-compress", QRC_PATH, "-o", RC_PY_PATH])
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,4 +1,5 @@
 # UI module - frontend components
 from .main_window import MainWindow, SettingsDialog
+from .settings import ScanSettings
 from .results_view import ResultsView
 from .components import ThumbnailWidget, SyncImageWidget, ThumbnailLoader, FlowLayout, THUMBNAIL_SIZE
@@ -2,61 +2,232 @@
 ui_components.py - SmartMediaCleaner Phase 2
 カスタムUIウィジェット群
 """
+import hashlib
+import multiprocessing
 import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
 from pathlib import Path
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QCheckBox,
     QGraphicsView, QGraphicsScene, QGraphicsPixmapItem,
-    QFrame, QPushButton, QSizePolicy, QScrollArea
+    QFrame, QPushButton, QSizePolicy, QScrollArea, QLayout
 )
-from PySide6.QtCore import Qt, Signal, QThread, QObject, QRectF, QPointF
-from PySide6.QtGui import QPixmap, QImage, QPainter, QWheelEvent, QMouseEvent, QKeyEvent
+from PySide6.QtCore import (
+    Qt, Signal, QThread, QObject, QRect, QRectF, QPoint, QPointF, QSize, QStandardPaths, QTimer,
+    QRunnable, QThreadPool
+)
+from PySide6.QtGui import QPixmap, QImage, QImageReader, QPainter, QFontMetrics, QWheelEvent, QMouseEvent, QKeyEvent
 
 # サムネイルサイズ定数
 THUMBNAIL_SIZE = 200
 
+# 読み込み結果をまとめて送る単位 (件数 / 秒)
+THUMBNAIL_BATCH_SIZE = 16
+THUMBNAIL_BATCH_INTERVAL = 0.1
+# プロセスプールに同時に投入しておく件数 (スクロールで不要になった分を取り消せるよう少なめに)
+THUMBNAIL_IN_FLIGHT = max(4, (os.cpu_count() or 1) * 2)
+
+# 比較モードで最初に読み込む画像の長辺上限 (拡大したときだけ原寸を読み直す)
+COMPARE_PROXY_MAX_EDGE = 4096
+
+# ディスク上のサムネイルキャッシュの上限 (超えた分は古いものから削除)
+THUMBNAIL_DISK_CACHE_LIMIT = 500 * 1024 * 1024
+
+# サムネイルのデコード用プロセスプール (起動コストを払うのは初回のみ)
+_thumbnail_pool = None
+_thumbnail_pool_lock = threading.Lock()
+
+
+def _get_thumbnail_pool() -> ProcessPoolExecutor:
+    global _thumbnail_pool
+    with _thumbnail_pool_lock:
+        if _thumbnail_pool is None:
+            # Qt のスレッドが動いているプロセスを fork しないよう spawn で起動
+            _thumbnail_pool = ProcessPoolExecutor(max_workers=os.cpu_count() or 1,
+                                                  mp_context=multiprocessing.get_context("spawn"))
+            # 起動時に一度だけディスクキャッシュを整理 (GUIスレッドを止めない)
+            _thumbnail_pool.submit(prune_thumbnail_cache, thumbnail_cache_dir(), THUMBNAIL_DISK_CACHE_LIMIT)
+        return _thumbnail_pool
+
+
+def thumbnail_cache_dir() -> str:
+    """ディスクキャッシュの保存先 (なければ作成)"""
+    base = QStandardPaths.writableLocation(QStandardPaths.GenericCacheLocation)
+    cache_dir = os.path.join(base, "SmartMediaCleaner", "thumbnails")
+    os.makedirs(cache_dir, exist_ok=True)
+    return cache_dir
+
+
+def prune_thumbnail_cache(cache_dir: str, limit: int):
+    """合計サイズが limit を超えていれば、最後に使われたのが古い順に削除"""
+    try:
+        entries = [e for e in os.scandir(cache_dir) if e.is_file()]
+    except OSError:
+        return
+    stats = [(e.stat().st_mtime, e.stat().st_size, e.path) for e in entries]
+    total = sum(size for _, size, _ in stats)
+    for _, size, path in sorted(stats):
+        if total <= limit:
+            break
+        try:
+            os.remove(path)
+            total -= size
+        except OSError:
+            pass
+
+
+def thumbnail_cache_path(cache_dir: str, path: str):
+    """
+    ディスクキャッシュのファイルパス ((パス, 更新日時, サイズ) から決まる)
+    元ファイルを stat できない場合は None
+    """
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    key = hashlib.blake2b(f"{path}|{st.st_mtime_ns}|{st.st_size}".encode("utf-8"),
+                          digest_size=16).hexdigest()
+    return os.path.join(cache_dir, key + ".webp")
+
+
+def decode_thumbnail(path: str, size: int, cache_dir: str = None):
+    """
+    画像をデコードしてサムネイルサイズに縮小 (子プロセスで実行)
+    cache_dir を指定すると (パス, 更新日時, サイズ) をキーに WebP で保存・再利用する
+    Returns: (RGBバイト列, 幅, 高さ) / 読み込めない場合は None
+    """
+    from PIL import Image
+    cache_path = thumbnail_cache_path(cache_dir, path) if cache_dir else None
+    if cache_path:
+        try:
+            with Image.open(cache_path) as img:
+                img = img.convert("RGB")
+            os.utime(cache_path)  # 使用日時を更新 (整理時に残す)
+            return img.tobytes(), img.width, img.height
+        except OSError:
+            pass  # 未キャッシュ (または壊れたキャッシュ)
+    try:
+        with Image.open(path) as img:
+            img.draft("RGB", (size, size))  # JPEG はデコード時に縮小
+            img = img.convert("RGB")
+            img.thumbnail((size, size))
+    except Exception:
+        return None
+    if cache_path:
+        # 他プロセスが読みかけのファイルを上書きしないよう一時ファイル経由で置き換え
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        try:
+            img.save(tmp_path, "WEBP", quality=80)
+            os.replace(tmp_path, cache_path)
+        except OSError:
+            pass
+    return img.tobytes(), img.width, img.height
+
 
 class ThumbnailLoader(QObject):
     """
     サムネイル画像を非同期で読み込むワーカー
+    stop() されるまで常駐し、request() で渡された読み込み待ちを順に処理する
     """
-    loaded = Signal(str, QPixmap)  # file_path, pixmap
+    loaded_batch = Signal(list)  # [(file_path, QImage), ...] (QPixmap への変換はGUIスレッドで行う)
     failed = Signal(str)  # file_path (読み込み失敗)
     finished = Signal()  # 完了シグナル
 
-    def __init__(self, file_paths: list):
+    def __init__(self, file_paths: list = ()):
         super().__init__()
-        self.file_paths = file_paths
+        self.cache_dir = thumbnail_cache_dir()
         self._is_running = True
+        self._queue = deque(file_paths)
+        self._in_flight = set()  # プロセスプールに投入済みのパス
+        self._cond = threading.Condition()
+
+    def request(self, paths: list) -> list:
+        """
+        読み込み待ちを paths に差し替える (GUIスレッドから呼ぶ)
+        読み込まれないまま外れたパスを返す (投入済みのものは差し替えずそのまま読み込む)
+        """
+        with self._cond:
+            wanted = set(paths)
+            dropped = [p for p in self._queue if p not in wanted]
+            self._queue = deque(p for p in paths if p not in self._in_flight)
+            self._cond.notify()
+        return dropped
 
     def stop(self):
-        self._is_running = False
+        with self._cond:
+            self._is_running = False
+            self._cond.notify()
 
     def run(self):
-        """ファイルリストを順番に読み込み、シグナルを発行"""
-        for path in self.file_paths:
-            if not self._is_running:
-                break
-            try:
-                pixmap = QPixmap(path)
-                if not pixmap.isNull():
-                    # サムネイルサイズにリサイズ (アスペクト比維持)
-                    scaled = pixmap.scaled(
-                        THUMBNAIL_SIZE, THUMBNAIL_SIZE,
-                        Qt.KeepAspectRatio,
-                        Qt.SmoothTransformation
-                    )
-                    self.loaded.emit(path, scaled)
-                else:
+        """
+        デコードと縮小をプロセスプールで並列に行い、完了順にシグナルを発行
+        子プロセスからは縮小済みの画素データだけを受け取る
+        QPixmap はGUIスレッド以外で扱えないため、ここでは QImage までを作る
+        投入は THUMBNAIL_IN_FLIGHT 件ずつに抑え、スクロールで外れたパスは読み込まない
+        GUIスレッドへは THUMBNAIL_BATCH_SIZE 件か THUMBNAIL_BATCH_INTERVAL 秒ごとにまとめて送る
+        """
+        batch = []
+        last_emit = time.monotonic()
+        pool = _get_thumbnail_pool()
+        futures = {}
+        while True:
+            with self._cond:
+                while self._is_running and not self._queue and not futures:
+                    self._cond.wait()
+                if not self._is_running:
+                    break
+                while self._queue and len(futures) < THUMBNAIL_IN_FLIGHT:
+                    path = self._queue.popleft()
+                    futures[pool.submit(decode_thumbnail, path, THUMBNAIL_SIZE, self.cache_dir)] = path
+                    self._in_flight.add(path)
+            
+            done, _ = wait(futures, timeout=THUMBNAIL_BATCH_INTERVAL, return_when=FIRST_COMPLETED)
+            for future in done:
+                path = futures.pop(future)
+                with self._cond:
+                    self._in_flight.discard(path)
+                try:
+                    result = future.result()
+                except Exception:
+                    result = None
+                if result is None:
                     # 読み込み失敗
                     self.failed.emit(path)
-            except Exception:
-                self.failed.emit(path)
+                    continue
+                data, width, height = result
+                # copy() で画素を QImage 自身のバッファに移し、data の寿命に依存させない
+                image = QImage(data, width, height, width * 3, QImage.Format_RGB888).copy()
+                batch.append((path, image))
+            
+            now = time.monotonic()
+            if batch and (len(batch) >= THUMBNAIL_BATCH_SIZE or now - last_emit >= THUMBNAIL_BATCH_INTERVAL or not futures):
+                self.loaded_batch.emit(batch)
+                batch = []
+                last_emit = now
+        
+        for f in futures:
+            f.cancel()
         
         # 完了シグナルを発行
         self.finished.emit()
 
 
+# ファイル名の省略表示に使うフォント情報 (ウィジェットごとに作らない)
+_name_font_metrics = None
+
+
+def _name_metrics(label: QLabel) -> QFontMetrics:
+    global _name_font_metrics
+    if _name_font_metrics is None:
+        # 未表示のラベルはスタイルシートのフォントがまだ反映されていないため先に適用する
+        label.ensurePolished()
+        _name_font_metrics = QFontMetrics(label.font())
+    return _name_font_metrics
+
+
 class ThumbnailWidget(QFrame):
     """
     サムネイル表示ウィジェット
@@ -93,11 +264,11 @@ class ThumbnailWidget(QFrame):
         self.image_label.mousePressEvent = self._on_image_click
         layout.addWidget(self.image_label)
         
-        # ファイル名 (省略表示)
-        filename = os.path.basename(file_path)
-        if len(filename) > 20:
-            filename = filename[:17] + "..."
-        self.name_label = QLabel(filename)
+        # ファイル名 (表示幅に合わせて中央を省略)
+        self.name_label = QLabel()
+        self.name_label.setTextFormat(Qt.PlainText)
+        self.name_label.setText(_name_metrics(self.name_label).elidedText(
+            os.path.basename(file_path), Qt.ElideMiddle, THUMBNAIL_SIZE))
         self.name_label.setToolTip(file_path)
         self.name_label.setAlignment(Qt.AlignCenter)
         layout.addWidget(self.name_label)
@@ -187,9 +358,17 @@ class SyncGraphicsView(QGraphicsView):
         self.setResizeAnchor(QGraphicsView.AnchorViewCenter)
         self.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
         self.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        # 画像1枚が常に全体を覆うため、差分領域の計算をせず毎回全体を描き直す
+        self.setViewportUpdateMode(QGraphicsView.FullViewportUpdate)
         
         self._zoom_factor = 1.0
         self._is_syncing = False  # 無限ループ防止フラグ
+        
+        # 連続したホイール/スクロールの同期通知は 10ms まとめて最後の状態だけ送る
+        self._sync_timer = QTimer(self)
+        self._sync_timer.setSingleShot(True)
+        self._sync_timer.setInterval(10)
+        self._sync_timer.timeout.connect(self._emit_sync)
     
     def wheelEvent(self, event: QWheelEvent):
         """マウスホイールでズーム"""
@@ -210,13 +389,19 @@ class SyncGraphicsView(QGraphicsView):
         
         self.setTransform(self.transform().scale(factor, factor))
         
-        # 同期シグナル発行
+        # 同期シグナル発行 (まとめて送る)
+        self._sync_timer.start()
+    
+    def _emit_sync(self):
+        """現在のズームと中心位置を同期シグナルで送る"""
         center = self.mapToScene(self.viewport().rect().center())
         self.sync_transform.emit(self._zoom_factor, center)
     
     def apply_sync(self, zoom: float, center: QPointF):
         """他のビューからの同期を適用"""
         self._is_syncing = True
+        # 拡大とセンタリングの途中状態を描画しない
+        self.setUpdatesEnabled(False)
         
         # ズームレベルを合わせる
         current_zoom = self._zoom_factor
@@ -228,14 +413,86 @@ class SyncGraphicsView(QGraphicsView):
         # 中心位置を合わせる
         self.centerOn(center)
         
+        self.setUpdatesEnabled(True)
         self._is_syncing = False
     
     def scrollContentsBy(self, dx, dy):
         """スクロール時にも同期"""
         super().scrollContentsBy(dx, dy)
         if not self._is_syncing:
-            center = self.mapToScene(self.viewport().rect().center())
-            self.sync_transform.emit(self._zoom_factor, center)
+            self._sync_timer.start()
+
+
+# 比較モードで表示する EXIF タグ (Exif IFD 内のタグID, 表示ラベル)
+_EXIF_IFD = 0x8769
+_EXIF_TAGS = (
+    (0x9003, "📅"),   # DateTimeOriginal
+    (0x8827, "ISO"),  # ISOSpeedRatings
+    (0x829A, "⏱"),   # ExposureTime
+    (0x829D, "F"),    # FNumber
+)
+
+
+def read_exif_summary(path: str) -> str:
+    """
+    撮影日時/ISO/シャッター速度/F値を1行にまとめる (なければ空文字)
+    Exif IFD だけを読み、タグはIDで直接引く
+    """
+    try:
+        from PIL import Image
+        
+        with Image.open(path) as img:
+            exif_ifd = img.getexif().get_ifd(_EXIF_IFD)
+        info = [f"{label} {exif_ifd[tag_id]}" for tag_id, label in _EXIF_TAGS if tag_id in exif_ifd]
+        return " | ".join(info)
+    except Exception:
+        return ""
+
+
+class _ExifSignals(QObject):
+    loaded = Signal(int, str, str)  # 世代, パス, EXIF文字列
+
+
+class _ExifTask(QRunnable):
+    """
+    read_exif_summary を QThreadPool 上で実行し、結果をシグナルでGUIスレッドへ送る
+    QRunnable は QObject ではないため、シグナルは別の QObject に持たせる
+    """
+
+    def __init__(self, generation: int, path: str):
+        super().__init__()
+        self.generation = generation
+        self.path = path
+        self.signals = _ExifSignals()
+
+    def run(self):
+        exif = read_exif_summary(self.path)
+        if exif:
+            self.signals.loaded.emit(self.generation, self.path, exif)
+
+
+# ピーキング/ヒストグラムの計算に使う画像の長辺上限 (表示上は原寸と見分けがつかない)
+COMPARE_ANALYSIS_MAX_EDGE = 2048
+
+
+def _read_analysis_image(path: str):
+    """ピーキング/ヒストグラム用に画像を BGR で読み込み、長辺 COMPARE_ANALYSIS_MAX_EDGE まで縮小"""
+    import cv2
+    import numpy as np
+    
+    # 非ASCIIパスでも読めるよう imdecode を使う (fromfile は bytes を経由せず配列に直接読む)
+    img = cv2.imdecode(np.fromfile(path, dtype=np.uint8), cv2.IMREAD_COLOR)
+    if img is None:
+        return None
+    h, w = img.shape[:2]
+    if max(h, w) > COMPARE_ANALYSIS_MAX_EDGE:
+        scale = COMPARE_ANALYSIS_MAX_EDGE / max(h, w)
+        img = cv2.resize(img, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+    return img
+
+
+# ピーキングの赤 (BGR) を 0.3 倍した値を10倍した整数 (整数演算でブレンドするため)
+_PEAKING_RED = (0, 0, 255 * 3)
 
 
 class SyncImageWidget(QWidget):
@@ -253,6 +510,10 @@ class SyncImageWidget(QWidget):
         self.right_path = ""
         self.left_blur = None
         self.right_blur = None
+        self.left_size = None
+        self.right_size = None
+        self._exif_generation = 0  # set_images ごとに増やし、古い EXIF 読み込み結果を無視する
+        self._mode_pixmaps = {}  # (パス, モード) -> ピーキング/ヒストグラム画像
         self.display_mode = "normal"  # normal, histogram, peaking
         
         # キーボードフォーカスを有効化
@@ -294,8 +555,11 @@ class SyncImageWidget(QWidget):
         left_container = QVBoxLayout()
         self.left_view = SyncGraphicsView()
         self.left_scene = QGraphicsScene()
+        self.left_scene.setItemIndexMethod(QGraphicsScene.NoIndex)  # アイテムは1つなので索引不要
         self.left_view.setScene(self.left_scene)
-        self.left_item = None
+        # アイテムは使い回し、画像の差し替えは setPixmap で行う
+        self.left_item = QGraphicsPixmapItem()
+        self.left_scene.addItem(self.left_item)
         left_container.addWidget(self.left_view)
         
         self.left_label = QLabel()
@@ -315,8 +579,11 @@ class SyncImageWidget(QWidget):
         right_container = QVBoxLayout()
         self.right_view = SyncGraphicsView()
         self.right_scene = QGraphicsScene()
+        self.right_scene.setItemIndexMethod(QGraphicsScene.NoIndex)  # アイテムは1つなので索引不要
         self.right_view.setScene(self.right_scene)
-        self.right_item = None
+        # アイテムは使い回し、画像の差し替えは setPixmap で行う
+        self.right_item = QGraphicsPixmapItem()
+        self.right_scene.addItem(self.right_item)
         right_container.addWidget(self.right_view)
         
         self.right_label = QLabel()
@@ -336,6 +603,13 @@ class SyncImageWidget(QWidget):
         # 同期接続
         self.left_view.sync_transform.connect(self._sync_to_right)
         self.right_view.sync_transform.connect(self._sync_to_left)
+        
+        # 縮小版を表示中の画像 (属性名 -> パス)。拡大が止まったら原寸に差し替える
+        self._proxy_paths = {}
+        self._full_res_timer = QTimer(self)
+        self._full_res_timer.setSingleShot(True)
+        self._full_res_timer.setInterval(150)
+        self._full_res_timer.timeout.connect(self._load_full_resolution)
     
     def _set_mode(self, mode: str):
         """表示モード切替"""
@@ -345,12 +619,21 @@ class SyncImageWidget(QWidget):
         self.mode_peak_btn.setChecked(mode == "peaking")
         self._refresh_images()
     
-    def set_images(self, left_path: str, right_path: str, left_blur: float = None, right_blur: float = None):
-        """比較する2枚の画像をセット"""
+    def set_images(self, left_path: str, right_path: str, left_blur: float = None, right_blur: float = None,
+                   left_size: int = None, right_size: int = None):
+        """
+        比較する2枚の画像をセット
+        left_size/right_size にスキャン時のファイルサイズを渡すと、ラベル表示で stat しない
+        """
+        # 表示中でなくなった画像のモード別キャッシュを捨てる
+        self._mode_pixmaps = {key: pixmap for key, pixmap in self._mode_pixmaps.items()
+                              if key[0] in (left_path, right_path)}
         self.left_path = left_path
         self.right_path = right_path
         self.left_blur = left_blur
         self.right_blur = right_blur
+        self.left_size = left_size
+        self.right_size = right_size
         self._refresh_images()
         self._update_labels()
         
@@ -372,30 +655,75 @@ class SyncImageWidget(QWidget):
     
     def _refresh_images(self):
         """現在のモードで画像を更新"""
+        self._full_res_timer.stop()
+        self._proxy_paths.clear()
         for path, scene, view, attr_name in [
             (self.left_path, self.left_scene, self.left_view, "left_item"),
             (self.right_path, self.right_scene, self.right_view, "right_item")
         ]:
-            scene.clear()
+            item = getattr(self, attr_name)
             if not path:
-                continue
-            
-            pixmap = self._get_display_pixmap(path)
+                pixmap = QPixmap()
+            elif self.display_mode == "normal":
+                pixmap, is_proxy = self._load_proxy_pixmap(path)
+                if is_proxy:
+                    self._proxy_paths[attr_name] = path
+            else:
+                pixmap = self._get_display_pixmap(path)
+            item.setScale(1.0)
+            item.setPixmap(pixmap)
+            # シーンの範囲は画像の大きさで固定する (アイテム全体の外接矩形を計算させない)
+            rect = QRectF(pixmap.rect())
+            scene.setSceneRect(rect)
             if not pixmap.isNull():
-                item = QGraphicsPixmapItem(pixmap)
-                scene.addItem(item)
-                view.fitInView(item, Qt.KeepAspectRatio)
-                setattr(self, attr_name, item)
+                view.fitInView(rect, Qt.KeepAspectRatio)
     
     def _get_display_pixmap(self, path: str) -> QPixmap:
-        """モードに応じた画像を取得"""
+        """モードに応じた画像を取得 (ピーキング/ヒストグラムは (パス, モード) ごとに保持)"""
         if self.display_mode == "normal":
-            return QPixmap(path)
-        elif self.display_mode == "peaking":
-            return self._create_peaking_image(path)
-        elif self.display_mode == "histogram":
-            return self._create_histogram_image(path)
-        return QPixmap(path)
+            return self._load_proxy_pixmap(path)[0]
+        key = (path, self.display_mode)
+        pixmap = self._mode_pixmaps.get(key)
+        if pixmap is None:
+            if self.display_mode == "peaking":
+                pixmap = self._create_peaking_image(path)
+            elif self.display_mode == "histogram":
+                pixmap = self._create_histogram_image(path)
+            else:
+                return QPixmap(path)
+            self._mode_pixmaps[key] = pixmap
+        return pixmap
+    
+    def _load_proxy_pixmap(self, path: str):
+        """
+        長辺 COMPARE_PROXY_MAX_EDGE までに縮小して読み込む (JPEG はデコード時に縮小される)
+        Returns: (pixmap, 縮小したかどうか)
+        """
+        reader = QImageReader(path)
+        size = reader.size()
+        is_proxy = size.isValid() and max(size.width(), size.height()) > COMPARE_PROXY_MAX_EDGE
+        if is_proxy:
+            reader.setScaledSize(size.scaled(COMPARE_PROXY_MAX_EDGE, COMPARE_PROXY_MAX_EDGE,
+                                             Qt.KeepAspectRatio))
+        return QPixmap.fromImage(reader.read()), is_proxy
+    
+    def _on_view_transformed(self):
+        """縮小版を等倍以上に拡大したら、操作が止まってから原寸を読み込む"""
+        for attr_name, view in (("left_item", self.left_view), ("right_item", self.right_view)):
+            if attr_name in self._proxy_paths and view.transform().m11() > 1.0:
+                self._full_res_timer.start()
+                return
+    
+    def _load_full_resolution(self):
+        """縮小版を原寸の画像に差し替え (シーン上の大きさは変えない)"""
+        for attr_name, path in list(self._proxy_paths.items()):
+            item = getattr(self, attr_name)
+            pixmap = QPixmap(path)
+            if pixmap.isNull():
+                continue
+            item.setScale(item.pixmap().width() / pixmap.width())
+            item.setPixmap(pixmap)
+            del self._proxy_paths[attr_name]
     
     def _create_peaking_image(self, path: str) -> QPixmap:
         """エッジ強調 (ピーキング) 画像を作成"""
@@ -403,9 +731,7 @@ class SyncImageWidget(QWidget):
             import cv2
             import numpy as np
             
-            with open(path, "rb") as f:
-                data = np.frombuffer(f.read(), dtype=np.uint8)
-            img = cv2.imdecode(data, cv2.IMREAD_COLOR)
+            img = _read_analysis_image(path)
             if img is None:
                 return QPixmap(path)
             
@@ -413,17 +739,15 @@ class SyncImageWidget(QWidget):
             gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
             edges = cv2.Canny(gray, 50, 150)
             
-            # 元画像にエッジを赤でオーバーレイ
-            overlay = img.copy()
-            overlay[edges > 0] = [0, 0, 255]  # 赤色
-            
-            # 少し透過させてブレンド
-            result = cv2.addWeighted(img, 0.7, overlay, 0.3, 0)
+            # エッジ画素だけを赤と 7:3 でブレンド (画像全体のコピーと合成を避け、元画像に直接書き込む)
+            mask = edges.astype(bool)
+            img[mask] = (img[mask].astype(np.uint16) * 7 + _PEAKING_RED) // 10
+            result = img
             
             # QPixmapに変換
+            # OpenCV の BGR の並びのまま渡す (RGB への変換コピーをしない)
             h, w, ch = result.shape
-            result_rgb = cv2.cvtColor(result, cv2.COLOR_BGR2RGB)
-            q_img = QImage(result_rgb.data, w, h, ch * w, QImage.Format_RGB888)
+            q_img = QImage(result.data, w, h, ch * w, QImage.Format_BGR888)
             return QPixmap.fromImage(q_img)
         except Exception:
             return QPixmap(path)
@@ -434,9 +758,7 @@ class SyncImageWidget(QWidget):
             import cv2
             import numpy as np
             
-            with open(path, "rb") as f:
-                data = np.frombuffer(f.read(), dtype=np.uint8)
-            img = cv2.imdecode(data, cv2.IMREAD_COLOR)
+            img = _read_analysis_image(path)
             if img is None:
                 return QPixmap(path)
             
@@ -446,30 +768,40 @@ class SyncImageWidget(QWidget):
             hist_h = 100
             hist_img = np.zeros((hist_h, w, 3), dtype=np.uint8)
             
+            # 256本の棒を (行 x 階調) のマスクとして一括で塗り、最後に各階調の列へ配置
+            bars = np.zeros((hist_h, 256, 3), dtype=np.uint8)
+            rows = np.arange(hist_h)[:, None]
             colors = [(255, 0, 0), (0, 255, 0), (0, 0, 255)]
             for i, col in enumerate(colors):
                 hist = cv2.calcHist([img], [i], None, [256], [0, 256])
                 cv2.normalize(hist, hist, 0, hist_h, cv2.NORM_MINMAX)
-                for x in range(256):
-                    x_pos = int(x * w / 256)
-                    cv2.line(hist_img, (x_pos, hist_h), (x_pos, hist_h - int(hist[x])), col, 1)
+                bars[rows >= hist_h - hist.reshape(-1).astype(np.int32)] = col
+            hist_img[:, np.arange(256) * w // 256] = bars
             
             # 元画像の下にヒストグラムを結合
             combined = np.vstack([img, hist_img])
             
             # QPixmapに変換
+            # OpenCV の BGR の並びのまま渡す (RGB への変換コピーをしない)
             ch, cw = combined.shape[:2]
-            combined_rgb = cv2.cvtColor(combined, cv2.COLOR_BGR2RGB)
-            q_img = QImage(combined_rgb.data, cw, ch, 3 * cw, QImage.Format_RGB888)
+            q_img = QImage(combined.data, cw, ch, 3 * cw, QImage.Format_BGR888)
             return QPixmap.fromImage(q_img)
         except Exception:
             return QPixmap(path)
     
     def _update_labels(self):
         """ファイル情報 + EXIF をラベルに表示"""
-        for path, label, blur_score in [(self.left_path, self.left_label, self.left_blur), 
-                                        (self.right_path, self.right_label, self.right_blur)]:
-            if path and os.path.exists(path):
+        self._exif_generation += 1
+        for path, label, blur_score, size in [
+            (self.left_path, self.left_label, self.left_blur, self.left_size),
+            (self.right_path, self.right_label, self.right_blur, self.right_size)
+        ]:
+            if path and size is None:
+                try:
+                    size = os.path.getsize(path)
+                except OSError:
+                    path = ""  # 削除済みなど
+            if path:
                 info_lines = [os.path.basename(path)]
                 
                 # ブレスコア表示
@@ -477,49 +809,23 @@ class SyncImageWidget(QWidget):
                     info_lines.append(f"🔍 ブレ: {int(blur_score)}")
                 
                 # サイズ
-                size = os.path.getsize(path)
                 info_lines.append(f"📁 {self._format_size(size)}")
-                
-                # EXIF情報
-                exif = self._get_exif(path)
-                if exif:
-                    info_lines.append(exif)
-                
                 label.setText("\n".join(info_lines))
+                
+                # EXIF情報 (読み込みはスレッドプールで行い、届いたら追記)
+                task = _ExifTask(self._exif_generation, path)
+                task.signals.loaded.connect(self._on_exif_loaded)
+                QThreadPool.globalInstance().start(task)
             else:
                 label.setText("")
     
-    def _get_exif(self, path: str) -> str:
-        """EXIF情報を取得"""
-        try:
-            from PIL import Image
-            from PIL.ExifTags import TAGS
-            
-            img = Image.open(path)
-            exif_data = img._getexif()
-            if not exif_data:
-                return ""
-            
-            info = []
-            tag_names = {
-                "DateTimeOriginal": "📅",
-                "ISOSpeedRatings": "ISO",
-                "ExposureTime": "⏱",
-                "FNumber": "F"
-            }
-            
-            for tag_id, value in exif_data.items():
-                tag = TAGS.get(tag_id, tag_id)
-                if tag in tag_names:
-                    if tag == "ExposureTime" and isinstance(value, tuple):
-                        value = f"{value[0]}/{value[1]}s"
-                    elif tag == "FNumber" and isinstance(value, tuple):
-                        value = f"{value[0]/value[1]:.1f}"
-                    info.append(f"{tag_names[tag]} {value}")
-            
-            return " | ".join(info[:4]) if info else ""
-        except Exception:
-            return ""
+    def _on_exif_loaded(self, generation: int, path: str, exif: str):
+        """EXIF をラベルに追記 (画像が差し替えられた後の結果は捨てる)"""
+        if generation != self._exif_generation:
+            return
+        for side_path, label in ((self.left_path, self.left_label), (self.right_path, self.right_label)):
+            if side_path == path:
+                label.setText(f"{label.text()}\n{exif}")
     
     def _format_size(self, size: int) -> str:
         """ファイルサイズを読みやすい形式に"""
@@ -532,45 +838,85 @@ class SyncImageWidget(QWidget):
     def _sync_to_right(self, zoom: float, center: QPointF):
         """左から右へ同期"""
         self.right_view.apply_sync(zoom, center)
+        self._on_view_transformed()
     
     def _sync_to_left(self, zoom: float, center: QPointF):
         """右から左へ同期"""
         self.left_view.apply_sync(zoom, center)
+        self._on_view_transformed()
 
 
-class FlowLayout(QVBoxLayout):
+class FlowLayout(QLayout):
     """
-    疑似フローレイアウト
-    QScrollArea内で使用し、ウィジェットを横に並べて折り返す
-    (PySide6にはFlowLayoutがないため、QHBoxLayoutを複数段使用)
+    フローレイアウト
+    QScrollArea内で使用し、ウィジェットを横に並べて幅に合わせて折り返す
+    入れ子のレイアウトを作らず、setGeometry で各アイテムの位置を1回のループで計算する
     """
-    def __init__(self, parent=None, items_per_row=4):
+    def __init__(self, parent=None, items_per_row: int = None):
         super().__init__(parent)
-        self.items_per_row = items_per_row
-        self.current_row = None
-        self.current_count = 0
-        self.setAlignment(Qt.AlignTop | Qt.AlignLeft)
-        self._start_new_row()
-    
-    def _start_new_row(self):
-        self.current_row = QHBoxLayout()
-        self.current_row.setSpacing(10)
-        self.current_row.setAlignment(Qt.AlignLeft)
-        self.addLayout(self.current_row)
-        self.current_count = 0
+        self.items_per_row = items_per_row  # 1行あたりの上限 (None なら幅で決める)
+        self._items = []
+        self.setSpacing(10)
     
     def add_widget(self, widget):
-        if self.current_count >= self.items_per_row:
-            # 前の行にストレッチを追加
-            if self.current_row:
-                self.current_row.addStretch()
-            self._start_new_row()
-        self.current_row.addWidget(widget)
-        self.current_count += 1
+        self.addWidget(widget)
     
     def finalize(self):
-        """最後の行にストレッチを追加してレイアウトを完成"""
-        if self.current_row:
-            self.current_row.addStretch()
-        # 垂直方向にもストレッチを追加して下部の余白を確保
-        self.addStretch()
+        """互換用 (折り返しは setGeometry で行うため何もしない)"""
+    
+    def addItem(self, item):
+        self._items.append(item)
+    
+    def count(self) -> int:
+        return len(self._items)
+    
+    def itemAt(self, index: int):
+        return self._items[index] if 0 <= index < len(self._items) else None
+    
+    def takeAt(self, index: int):
+        return self._items.pop(index) if 0 <= index < len(self._items) else None
+    
+    def expandingDirections(self):
+        return Qt.Orientation(0)
+    
+    def hasHeightForWidth(self) -> bool:
+        return True
+    
+    def heightForWidth(self, width: int) -> int:
+        return self._do_layout(QRect(0, 0, width, 0), apply=False)
+    
+    def setGeometry(self, rect: QRect):
+        super().setGeometry(rect)
+        self._do_layout(rect, apply=True)
+    
+    def sizeHint(self) -> QSize:
+        return self.minimumSize()
+    
+    def minimumSize(self) -> QSize:
+        size = QSize()
+        for item in self._items:
+            size = size.expandedTo(item.minimumSize())
+        margins = self.contentsMargins()
+        return size + QSize(margins.left() + margins.right(), margins.top() + margins.bottom())
+    
+    def _do_layout(self, rect: QRect, apply: bool) -> int:
+        """左上から順に並べ、幅か items_per_row を超えたら折り返す (Returns: 必要な高さ)"""
+        margins = self.contentsMargins()
+        area = rect.adjusted(margins.left(), margins.top(), -margins.right(), -margins.bottom())
+        spacing = self.spacing()
+        x, y = area.x(), area.y()
+        row_height = 0
+        row_count = 0
+        for item in self._items:
+            size = item.sizeHint()
+            if row_count and (x + size.width() > area.right() + 1 or row_count == self.items_per_row):
+                x = area.x()
+                y += row_height + spacing
+                row_height = 0
+                row_count = 0
+            if apply:
+                item.setGeometry(QRect(QPoint(x, y), size))
+            x += size.width() + spacing
+            row_height = max(row_height, size.height())
+            row_count += 1
+        return y + row_height - rect.y() + margins.bottom()
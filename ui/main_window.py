@@ -4,22 +4,26 @@ main_window.py - SmartMediaCleaner
 """
 from PySide6.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, 
-    QHBoxLayout, QPushButton, QLabel, QFileDialog, 
+    QHBoxLayout, QGridLayout, QPushButton, QLabel, QFileDialog, 
     QProgressBar, QDoubleSpinBox, QGroupBox,
     QCheckBox, QDialog, QDialogButtonBox
 )
-from PySide6.QtCore import QThread, Slot, Qt
-from core.scanner import ScanWorker
-from .results_view import ResultsView
+import threading
+from collections import deque
+from PySide6.QtCore import QDir, QSettings, QThreadPool, QTimer, Slot, Qt
+from .results_view import ResultsView, TAB_BLUR, TAB_LOG
+from .settings import ScanSettings
+
+# 進捗表示のテンプレート (表示更新のたびに書式文字列を組み立てない)
+_SEARCHING_TEXT = "ファイルを検索中... ({}件)"
+_PROGRESS_TEXT = "処理中 ({}/{}): {}"
 
 
 class SettingsDialog(QDialog):
     """スキャン設定ダイアログ"""
-    def __init__(self, settings, parent=None):
+    def __init__(self, settings: ScanSettings, parent=None):
         super().__init__(parent)
         self.setWindowTitle("スキャン設定")
-        self.settings = settings.copy()
-        
         layout = QVBoxLayout(self)
         
         form_group = QGroupBox("基本設定")
@@ -30,14 +34,12 @@ class SettingsDialog(QDialog):
         blur_layout.addWidget(QLabel("ブレ判定閾値:"))
         self.blur_spin = QDoubleSpinBox()
         self.blur_spin.setRange(0, 5000)
-        self.blur_spin.setValue(self.settings.get("blur_threshold", 100.0))
         self.blur_spin.setToolTip("この値より低いスコアの画像をブレと判定")
         blur_layout.addWidget(self.blur_spin)
         form_layout.addLayout(blur_layout)
         
         # サブフォルダ
         self.subfolder_check = QCheckBox("サブフォルダを含める")
-        self.subfolder_check.setChecked(self.settings.get("recursive", True))
         self.subfolder_check.setToolTip("サブフォルダ内のファイルも再帰的にスキャン")
         form_layout.addWidget(self.subfolder_check)
         
@@ -52,7 +54,6 @@ class SettingsDialog(QDialog):
         sort_layout = QHBoxLayout()
         sort_layout.addWidget(QLabel("ブレ画像の並び順:"))
         self.sort_asc_check = QCheckBox("ブレ順 (い度い順)")
-        self.sort_asc_check.setChecked(self.settings.get("blur_sort_asc", True))
         sort_layout.addWidget(self.sort_asc_check)
         display_layout.addLayout(sort_layout)
         
@@ -63,13 +64,23 @@ class SettingsDialog(QDialog):
         buttons.accepted.connect(self.accept)
         buttons.rejected.connect(self.reject)
         layout.addWidget(buttons)
+        
+        self.set_settings(settings)
 
-    def get_settings(self):
-        return {
-            "blur_threshold": self.blur_spin.value(),
-            "recursive": self.subfolder_check.isChecked(),
-            "blur_sort_asc": self.sort_asc_check.isChecked()
-        }
+    def set_settings(self, settings: ScanSettings):
+        """各入力欄に設定値を反映 (ダイアログ再利用時にも呼ぶ)"""
+        self.settings = settings
+        self.blur_spin.setValue(settings.blur_threshold)
+        self.subfolder_check.setChecked(settings.recursive)
+        self.sort_asc_check.setChecked(settings.blur_sort_asc)
+
+    def get_settings(self) -> ScanSettings:
+        # ウィジェットの値は確定時に一度だけ取り出し、素の float/bool として保持
+        return ScanSettings(
+            blur_threshold=float(self.blur_spin.value()),
+            recursive=bool(self.subfolder_check.isChecked()),
+            blur_sort_asc=bool(self.sort_asc_check.isChecked())
+        )
 
 
 class MainWindow(QMainWindow):
@@ -83,61 +94,90 @@ class MainWindow(QMainWindow):
         
         central = QWidget()
         self.setCentralWidget(central)
-        main_layout = QVBoxLayout(central)
-        
-        # ヘッダー: パス表示 + ボタン (右上)
-        header_layout = QHBoxLayout()
+        # 入れ子のレイアウトを作らず1つのグリッドで配置
+        # 行0: パス表示 + ボタン (右上) / 行1: ステータス + プログレスバー / 行2: 結果表示
+        grid = QGridLayout(central)
         
         self.path_label = QLabel("フォルダが選択されていません")
         self.path_label.setWordWrap(True)
         self.path_label.setStyleSheet("color: #888888;")
-        header_layout.addWidget(self.path_label, 1)
+        grid.addWidget(self.path_label, 0, 0, 1, 2)
         
         self.run_btn = QPushButton("🚀 スキャン開始")
         self.run_btn.setEnabled(False)
         self.run_btn.clicked.connect(self.start_scan)
-        header_layout.addWidget(self.run_btn)
+        grid.addWidget(self.run_btn, 0, 2)
         
         self.select_btn = QPushButton("📁 フォルダを選択")
         self.select_btn.clicked.connect(self.select_folder)
-        header_layout.addWidget(self.select_btn)
+        grid.addWidget(self.select_btn, 0, 3)
         
         self.settings_btn = QPushButton("⚙ 設定")
         self.settings_btn.clicked.connect(self.open_settings_dialog)
-        header_layout.addWidget(self.settings_btn)
-        
-        main_layout.addLayout(header_layout)
+        grid.addWidget(self.settings_btn, 0, 4)
 
         # 設定値
-        self.settings = {
-            "blur_threshold": 100.0,
-            "recursive": True,
-            "blur_sort_asc": True
-        }
+        self.settings = ScanSettings()
+        self._settings_dialog = None
 
         # ステータス + プログレスバー
-        status_layout = QHBoxLayout()
         self.status_label = QLabel("待機中")
         self.status_label.setStyleSheet("font-size: 14px; color: #aaaaaa;")
-        status_layout.addWidget(self.status_label)
+        grid.addWidget(self.status_label, 1, 0)
         
         self.progress_bar = QProgressBar()
-        status_layout.addWidget(self.progress_bar, 1)
-        main_layout.addLayout(status_layout)
+        grid.addWidget(self.progress_bar, 1, 1, 1, 4)
 
         # 結果表示 (タブ: ブレ画像, 類似画像, 重複動画, ログ)
         self.results_view = ResultsView()
-        main_layout.addWidget(self.results_view, 1)  # stretch=1
+        grid.addWidget(self.results_view, 2, 0, 1, 5)
+        
+        grid.setColumnStretch(1, 1)
+        grid.setRowStretch(2, 1)
 
         # 内部状態
         self.target_folder = ""
-        self.thread = None
         self.worker = None
+        # スキャン専用のスレッドプール (終了時はこれだけを待つ)
+        self.scan_pool = QThreadPool(self)
+        self.scan_pool.setMaxThreadCount(1)
+
+        # OpenCV/NumPy などスキャナーの重い依存は別スレッドで先読みする
+        # (GUIスレッドで読み込むと表示直後の操作が数百ms固まる)
+        threading.Thread(target=self._warm_imports, daemon=True).start()
+
+        # 進捗表示は最新値だけを保持し、タイマーでまとめて反映 (最大約30Hz)
+        self._pending_progress = None
+        self._pb_max = -1  # 最後に設定した最大値 (同じ値の再設定を避ける)
+        self._progress_timer = QTimer(self)
+        self._progress_timer.setSingleShot(True)
+        self._progress_timer.setInterval(33)
+        self._progress_timer.timeout.connect(self._flush_progress)
+
+        # ログも同様にバッファし、約10Hzでまとめて追記
+        # (ログ欄は最大500行なので、それ以上溜めても表示されない)
+        self._log_buf = deque(maxlen=500)
+        self._log_timer = QTimer(self)
+        self._log_timer.setSingleShot(True)
+        self._log_timer.setInterval(100)
+        self._log_timer.timeout.connect(self._flush_log)
+
+    @staticmethod
+    def _warm_imports():
+        import core.scanner  # noqa: F401
 
     @Slot()
     def select_folder(self):
-        folder = QFileDialog.getExistingDirectory(self, "スキャンするフォルダを選択")
+        # 前回選択したフォルダから開く (既定ルートの列挙を避ける)
+        qs = QSettings("SmartMediaCleaner", "app")
+        start = self.target_folder or qs.value("last_dir", "", str) or QDir.homePath()
+        # シンボリックリンクの解決 (ネットワークドライブへのアクセス) を避ける
+        folder = QFileDialog.getExistingDirectory(
+            self, "スキャンするフォルダを選択", start,
+            QFileDialog.ShowDirsOnly | QFileDialog.DontResolveSymlinks | QFileDialog.ReadOnly
+        )
         if folder:
+            qs.setValue("last_dir", folder)
             self.target_folder = folder
             self.path_label.setText(folder)
             self.path_label.setStyleSheet("color: #e8e8e8;")
@@ -146,88 +186,123 @@ class MainWindow(QMainWindow):
 
     @Slot()
     def open_settings_dialog(self):
-        dialog = SettingsDialog(self.settings, self)
+        # ダイアログは初回のみ生成し、以降は値だけ入れ直して再利用
+        dialog = self._settings_dialog
+        if dialog is None:
+            dialog = self._settings_dialog = SettingsDialog(self.settings, self)
+        else:
+            dialog.set_settings(self.settings)
         if dialog.exec() == QDialog.Accepted:
             self.settings = dialog.get_settings()
             self.status_label.setText("設定を更新しました")
 
     @Slot()
     def start_scan(self):
+        # 連打などでキューに残ったクリックによる二重スキャンを防ぐ
+        if self.worker is not None:
+            return
+        self.run_btn.setEnabled(False)
         if not self.target_folder:
             return
 
-        self.run_btn.setEnabled(False)
         self.select_btn.setEnabled(False)
         self.results_view.log_area.clear()
         self.status_label.setText("スキャン初期化中...")
         
         # ログタブに切り替え
-        self.results_view.tabs.setCurrentWidget(self.results_view.log_tab)
+        self.results_view.tabs.setCurrentIndex(TAB_LOG)
 
-        self.thread = QThread()
-        self.worker = ScanWorker(
+        from core.scanner import ScanWorker, ScanRunnable
+
+        self.worker = worker = ScanWorker(
             self.target_folder, 
-            self.settings["blur_threshold"],
-            recursive=self.settings["recursive"]
+            self.settings.blur_threshold,
+            recursive=self.settings.recursive
         )
-        self.worker.moveToThread(self.thread)
 
-        self.thread.started.connect(self.worker.run)
-        self.worker.finished.connect(self.on_scan_finished)
-        self.worker.finished.connect(self.thread.quit)
-        self.worker.finished.connect(self.worker.deleteLater)
-        self.thread.finished.connect(self.thread.deleteLater)
-        self.worker.progress.connect(self.on_progress)
-        self.worker.log.connect(self.on_log)
+        # スキャンスレッド → GUIスレッドは常にキュー経由
+        worker.finished.connect(self.on_scan_finished, Qt.QueuedConnection)
+        worker.progress.connect(self.on_progress, Qt.QueuedConnection)
+        worker.log.connect(self.on_log, Qt.QueuedConnection)
+
+        # スレッドはプールのものを再利用する
+        self.scan_pool.start(ScanRunnable(worker))
 
-        self.thread.start()
+    @Slot(int, int)
+    def on_progress(self, current, total):
+        self._pending_progress = (current, total)
+        if not self._progress_timer.isActive():
+            self._progress_timer.start()
 
-    @Slot(int, int, str)
-    def on_progress(self, current, total, filename):
-        self.progress_bar.setMaximum(total)
-        self.progress_bar.setValue(current)
-        self.status_label.setText(f"処理中 ({current}/{total}): {filename}")
+    @Slot()
+    def _flush_progress(self):
+        if self._pending_progress is None:
+            return
+        current, total = self._pending_progress
+        self._pending_progress = None
+        if total != self._pb_max:
+            self.progress_bar.setMaximum(total)  # 0 の間はビジー表示
+            self._pb_max = total
+        if total == 0:
+            # ファイル列挙中 (総数未確定)
+            self.status_label.setText(_SEARCHING_TEXT.format(current))
+            return
+        if current != self.progress_bar.value():
+            self.progress_bar.setValue(current)
+        # ファイル名は表示するときだけワーカーから取り出す
+        # 長いファイル名はラベルの再レイアウトが重くなるため末尾のみ表示
+        filename = self.worker.current_name() if self.worker is not None else ""
+        self.status_label.setText(_PROGRESS_TEXT.format(current, total, filename[-60:]))
 
     @Slot(str)
     def on_log(self, message):
-        self.results_view.append_log(f"[LOG] {message}")
+        self._log_buf.append("[LOG] " + message)
+        if not self._log_timer.isActive():
+            self._log_timer.start()
 
-    @Slot(dict)
-    def on_scan_finished(self, results):
+    @Slot()
+    def _flush_log(self):
+        if self._log_buf:
+            self.results_view.append_log("\n".join(self._log_buf))
+            self._log_buf.clear()
+
+    @Slot(dict, dict)
+    def on_scan_finished(self, results, summary):
+        self.worker = None
+        self._progress_timer.stop()
+        self._flush_progress()
+        self._log_timer.stop()
+        self._flush_log()
         self.status_label.setText("スキャン完了")
         self.progress_bar.setValue(self.progress_bar.maximum())
         self.run_btn.setEnabled(True)
         self.select_btn.setEnabled(True)
         
-        scanned = results.get("scanned_count", 0)
-        blur_count = len(results.get("blur_images", []))
-        sim_groups = len(results.get("similar_groups", {}))
-        dup_videos = len(results.get("duplicate_videos", {}))
-        
-        self.results_view.append_log(
-            f"\n=== スキャン結果 ===\n"
-            f"走査ファイル数: {scanned}\n"
-            f"ブレ画像検出数: {blur_count}\n"
-            f"類似画像グループ: {sim_groups}\n"
-            f"重複動画グループ: {dup_videos}"
-        )
+        # プレーンテキストとして1回で追記
+        lines = [
+            "",
+            "=== スキャン結果 ===",
+            f"走査ファイル数: {summary['scanned']}",
+            f"ブレ画像検出数: {summary['blur']}",
+            f"類似画像グループ: {summary['sim_groups']}",
+            f"重複動画グループ: {summary['dup_videos']}",
+        ]
+        self.results_view.append_log("\n".join(lines))
         
         # 結果を読み込み、ソート適用、ブレ画像タブに切り替え
-        self.results_view.load_results(results)
-        self.results_view._set_blur_sort(ascending=self.settings.get("blur_sort_asc", True))
-        self.results_view.tabs.setCurrentIndex(0)
+        # (大量のウィジェット追加による再描画を最後の1回にまとめる)
+        self.results_view.setUpdatesEnabled(False)
+        try:
+            self.results_view.load_results(results)
+            self.results_view._set_blur_sort(ascending=self.settings.blur_sort_asc)
+            self.results_view.tabs.setCurrentIndex(TAB_BLUR)
+        finally:
+            self.results_view.setUpdatesEnabled(True)
 
     def cleanup(self):
-        try:
-            if self.worker:
-                self.worker.stop()
-            if self.thread and self.thread.isRunning():
-                self.thread.quit()
-                self.thread.wait(2000)
-                if self.thread.isRunning():
-                    self.thread.terminate()
-        except RuntimeError:
-            pass
+        # 中断を要求するだけで待たない (ワーカーはファイル単位で停止を確認して終了する)
+        if self.worker:
+            self.worker.stop()
 
     def closeEvent(self, event):
         self.cleanup()
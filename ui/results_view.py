@@ -2,23 +2,77 @@
 results_view.py - SmartMediaCleaner Phase 2
 スキャン結果表示画面 (タブ構成)
 """
+import functools
 import os
-from pathlib import Path
-from send2trash import send2trash
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QTabWidget, QScrollArea,
     QPushButton, QLabel, QTableWidget, QTableWidgetItem, QCheckBox,
-    QHeaderView, QMessageBox, QFrame, QStackedWidget, QSizePolicy,
-    QAbstractItemView, QSlider, QListView, QListWidget, QListWidgetItem,
-    QTextEdit
+    QHeaderView, QMessageBox, QFrame, QStackedWidget,
+    QAbstractItemView, QSlider, QListWidget, QListWidgetItem,
+    QPlainTextEdit
 )
-from PySide6.QtCore import Qt, Signal, Slot, QThread, QSize
+from PySide6.QtCore import Qt, Slot, QThread, QSize, QPoint, QTimer
 from PySide6.QtGui import QPixmap, QIcon
 
 from .components import (
-    ThumbnailWidget, SyncImageWidget, ThumbnailLoader, FlowLayout, THUMBNAIL_SIZE
+    ThumbnailWidget, SyncImageWidget, ThumbnailLoader, THUMBNAIL_SIZE
 )
 
+# content_stack のページ番号
+PAGE_TABS, PAGE_COMPARE = 0, 1
+# tabs のタブ番号 (_init_ui の addTab 順)
+TAB_BLUR, TAB_SIMILAR, TAB_VIDEO, TAB_CORRUPTED, TAB_LOG = range(5)
+
+# 読み込み済みサムネイルのキャッシュ上限 (ソート切替や再表示で再デコードしない)
+THUMBNAIL_CACHE_SIZE = 500
+# スキャン結果に記録がない場合の類似グループのハミング距離 (core.scanner.SIMILAR_HASH_DISTANCE)
+DEFAULT_SIMILAR_DISTANCE = 4
+# スクロール時に可視範囲の前後で先読みするアイテム数
+SCROLL_PREFETCH = 10
+# 類似/動画グループのウィジェットを1回のイベント処理で作る数
+GROUP_BUILD_BATCH = 20
+# ゴミ箱への移動を並行して行うスレッド数 (I/O待ちが主なためCPU数より多めに)
+DELETE_WORKERS = 8
+
+
+# スキャン結果の要素の形式は一覧内で共通なので、先頭の要素で変換関数を1度だけ選ぶ
+def _blur_item_normalizer(sample, image_metadata: dict):
+    """ブレ画像の要素を (path, blur_score, face_count) に変換する関数 (未対応の形式は None)"""
+    if isinstance(sample, tuple) and len(sample) >= 3:
+        return lambda item: (item[0], item[1] or 0, item[2] or 0)
+
+    def from_metadata(path):
+        meta = image_metadata.get(path, {})
+        return path, meta.get("blur_score", 0) or 0, meta.get("face_count", 0) or 0
+
+    if isinstance(sample, (list, tuple)) and len(sample) >= 1:
+        return lambda item: from_metadata(item[0])
+    if isinstance(sample, str):
+        return from_metadata
+    return None
+
+
+def _group_item_normalizer(sample, image_metadata: dict):
+    """類似画像の要素を (path, blur_score, face_count, size) に変換する関数 (未対応の形式は None)"""
+    if isinstance(sample, (list, tuple)) and len(sample) >= 4:
+        # Phase 3形式: (path, blur_score, face_count, size)
+        return lambda item: (item[0], item[1] or 0, item[2] or 0, item[3])
+
+    def from_metadata(path):
+        meta = image_metadata.get(path, {}) if image_metadata else {}
+        return path, meta.get("blur_score", 0), meta.get("face_count", 0), meta.get("size", 0)
+
+    if isinstance(sample, (list, tuple)) and len(sample) >= 2 and isinstance(sample[0], str):
+        # 2要素の場合: (path, something) - pathとmetadataから取得
+        return lambda item: from_metadata(item[0])
+    if isinstance(sample, str):
+        # Phase 1形式: pathのみ
+        return from_metadata
+    return None
+
+
 class ResultsView(QWidget):
     """
     スキャン結果を表示するメイン画面
@@ -27,13 +81,32 @@ class ResultsView(QWidget):
     - 重複動画タブ
     - 下部アクションバー
     """
-    back_requested = Signal()  # スキャン画面に戻る
+
+    # (パス, 更新日時) -> サムネイル (LRU、インスタンス間で共有)
+    _thumbnail_cache = OrderedDict()
 
     def __init__(self, parent=None):
         super().__init__(parent)
         self.scan_results = {}
         self.thumbnail_widgets = {}  # path -> ThumbnailWidget
+        self._video_checkboxes = {}  # path -> 動画カードのチェックボックス
+        self._video_cards = {}  # path -> 動画カード
+        # グループウィジェット -> 残っているファイルのパス (空グループの判定用)
+        self._group_members = {}
+        self._video_group_members = {}
         self.selected_files = set()  # 削除対象に選択されたファイルパス
+        self._size_cache = {}  # path -> ファイルサイズ (選択状態の集計用)
+        # クリック時の逆引き用
+        self._blur_paths = []  # ブレ画像のパス (表示順)
+        self._blur_sort_asc = True  # _blur_paths がスコア昇順か
+        self._blur_index = {}  # path -> _blur_paths 内の位置
+        self._path_to_group = {}  # path -> 所属する類似グループのパスリスト
+        self._blur_item_by_path = {}  # path -> ブレ画像リストのアイテム
+        # タブを開くまでウィジェット化しないグループ [(group_hash, items, best_path), ...]
+        self._pending_similar = []
+        self._pending_videos = []
+        self.loaded_thumbnails = set()
+        self._queued_thumbnails = set()  # 読み込みを依頼してまだ結果が届いていないパス
         
         # サムネイルローダー
         self.loader_thread = None
@@ -66,6 +139,7 @@ class ResultsView(QWidget):
         self.log_tab = self._create_log_tab()
         self.tabs.addTab(self.log_tab, "ログ")
         
+        self.tabs.currentChanged.connect(self._on_tab_changed)
         self.content_stack.addWidget(self.tabs)
         
         # 比較モードウィジェット
@@ -103,6 +177,14 @@ class ResultsView(QWidget):
         self.blur_list.itemSelectionChanged.connect(self._on_blur_list_selection_changed)
         self.blur_list.itemDoubleClicked.connect(self._on_blur_item_double_clicked)
         
+        # スクロール中の連続イベントは最後の1回にまとめて処理
+        self._scroll_timer = QTimer(self)
+        self._scroll_timer.setSingleShot(True)
+        self._scroll_timer.setInterval(30)
+        self._scroll_timer.timeout.connect(self._on_blur_scroll)
+        # (start に直接つなぐとスクロール位置が間隔 (ms) として渡されるため引数は捨てる)
+        self.blur_list.verticalScrollBar().valueChanged.connect(lambda _: self._scroll_timer.start())
+        
         layout.addWidget(self.blur_list)
         return container
     
@@ -117,26 +199,39 @@ class ResultsView(QWidget):
         self.threshold_slider = QSlider(Qt.Horizontal)
         self.threshold_slider.setMinimum(0)
         self.threshold_slider.setMaximum(20)
-        self.threshold_slider.setValue(0)  # 0 = 完全一致のみ
+        # 値がそのままハミング距離 (0 = 完全一致)。スキャン時の距離で開く
+        self.threshold_slider.setValue(DEFAULT_SIMILAR_DISTANCE)
         self.threshold_slider.setTickInterval(5)
         self.threshold_slider.setTickPosition(QSlider.TicksBelow)
         self.threshold_slider.valueChanged.connect(self._on_threshold_changed)
         threshold_layout.addWidget(self.threshold_slider, 1)
         
-        self.threshold_label = QLabel("0 (完全一致)")
+        # ドラッグ中は再グルーピングせず、止まってから1回だけ実行
+        self._threshold_timer = QTimer(self)
+        self._threshold_timer.setSingleShot(True)
+        self._threshold_timer.setInterval(200)
+        self._threshold_timer.timeout.connect(self._apply_threshold)
+        
+        self.threshold_label = QLabel()
+        self._update_threshold_label(DEFAULT_SIMILAR_DISTANCE)
         self.threshold_label.setFixedWidth(100)
         threshold_layout.addWidget(self.threshold_label)
         layout.addLayout(threshold_layout)
         
         # スクロールエリア
-        scroll = QScrollArea()
-        scroll.setWidgetResizable(True)
-        
-        self.similar_content = QWidget()
-        self.similar_layout = QVBoxLayout(self.similar_content)
-        scroll.setWidget(self.similar_content)
-        
-        layout.addWidget(scroll)
+        self.similar_scroll = QScrollArea()
+        self.similar_scroll.setWidgetResizable(True)
+        self._reset_similar_content()
+        
+        # サムネイルは表示範囲のグループ分だけ、スクロールが止まってから読み込む
+        self._similar_scroll_timer = QTimer(self)
+        self._similar_scroll_timer.setSingleShot(True)
+        self._similar_scroll_timer.setInterval(30)
+        self._similar_scroll_timer.timeout.connect(self._on_similar_scroll)
+        self.similar_scroll.verticalScrollBar().valueChanged.connect(
+            lambda _: self._similar_scroll_timer.start())
+        
+        layout.addWidget(self.similar_scroll)
         return container
     
     def _create_video_tab(self) -> QWidget:
@@ -145,14 +240,11 @@ class ResultsView(QWidget):
         layout = QVBoxLayout(container)
         
         # スクロールエリア
-        scroll = QScrollArea()
-        scroll.setWidgetResizable(True)
-        
-        self.video_content = QWidget()
-        self.video_layout = QVBoxLayout(self.video_content)
-        scroll.setWidget(self.video_content)
+        self.video_scroll = QScrollArea()
+        self.video_scroll.setWidgetResizable(True)
+        self._reset_video_content()
         
-        layout.addWidget(scroll)
+        layout.addWidget(self.video_scroll)
         return container
     
     def _create_corrupted_tab(self) -> QWidget:
@@ -189,6 +281,7 @@ class ResultsView(QWidget):
         self.corrupted_table.setEditTriggers(QAbstractItemView.NoEditTriggers)  # 編集不可
         self.corrupted_table.setFocusPolicy(Qt.NoFocus)  # フォーカス枠を削除
         self.corrupted_table.setAlternatingRowColors(True)
+        self.corrupted_table.itemChanged.connect(self._on_corrupted_item_changed)
         
         layout.addWidget(self.corrupted_table)
         return container
@@ -198,8 +291,12 @@ class ResultsView(QWidget):
         container = QWidget()
         layout = QVBoxLayout(container)
         
-        self.log_area = QTextEdit()
+        # リッチテキストのレイアウトを避けるためプレーンテキストで保持し、行数も制限
+        self.log_area = QPlainTextEdit()
         self.log_area.setReadOnly(True)
+        self.log_area.setMaximumBlockCount(500)
+        self.log_area.setUndoRedoEnabled(False)
+        self.log_area.setLineWrapMode(QPlainTextEdit.NoWrap)
         self.log_area.setPlaceholderText("スキャンログがここに表示されます...")
         layout.addWidget(self.log_area)
         
@@ -207,7 +304,7 @@ class ResultsView(QWidget):
     
     def append_log(self, message: str):
         """ログを追加"""
-        self.log_area.append(message)
+        self.log_area.appendPlainText(message)
     
     def _create_action_bar(self) -> QFrame:
         """下部アクションバー"""
@@ -243,16 +340,31 @@ class ResultsView(QWidget):
     def load_results(self, results: dict):
         """スキャン結果を読み込んで表示"""
         self.scan_results = results
+        # 閾値スライダーはスキャン時の距離 (=スキャン結果のグループ) に戻す
+        self._threshold_timer.stop()
+        self.threshold_slider.blockSignals(True)
+        self.threshold_slider.setValue(self._scan_similar_distance())
+        self.threshold_slider.blockSignals(False)
+        self._update_threshold_label(self.threshold_slider.value())
         self.selected_files.clear()
         self.thumbnail_widgets.clear()
+        self._video_checkboxes = {}
+        self._video_cards = {}
+        self._group_members = {}
+        self._video_group_members = {}
+        self._path_to_group = {}
         
         # 既存のローダーを停止
         self._stop_loader()
+        # 作り直す動画カードのサムネイル読み込みは取り消す (スキャン後なので cv2 は読み込み済み)
+        from .video_preview import cancel_video_thumbnails
+        cancel_video_thumbnails()
         
         # 各タブをクリア
         self.blur_list.clear()
-        self._clear_layout(self.similar_layout)
-        self._clear_layout(self.video_layout)
+        self._blur_item_by_path = {}
+        self._reset_similar_content()
+        self._reset_video_content()
         self.corrupted_table.setRowCount(0)
         
         # 画像パスを収集
@@ -260,86 +372,53 @@ class ResultsView(QWidget):
         
         # メタデータ取得用
         image_metadata = results.get("image_metadata", {})
+        # スキャン時に取得済みのサイズを保持し、選択変更のたびに stat しない
+        self._size_cache = {path: meta.get("size", 0) for path, meta in image_metadata.items()}
         
         # ブレ画像タブ (Phase 5: QListWidget で仮想スクロール対応)
         blur_images = results.get("blur_images", [])
         
         # データを正規化してソート用リストを作成
-        normalized_blur = []
-        for item in blur_images:
-            if isinstance(item, tuple) and len(item) >= 3:
-                path, blur_score, face_count = item[0], item[1], item[2]
-            elif isinstance(item, (list, tuple)) and len(item) >= 1:
-                path = item[0]
-                meta = image_metadata.get(path, {})
-                blur_score = meta.get("blur_score", 0)
-                face_count = meta.get("face_count", 0)
-            elif isinstance(item, str):
-                path = item
-                meta = image_metadata.get(path, {})
-                blur_score = meta.get("blur_score", 0)
-                face_count = meta.get("face_count", 0)
-            else:
-                continue
-            normalized_blur.append((path, blur_score or 0, face_count or 0))
+        normalize = _blur_item_normalizer(blur_images[0], image_metadata) if blur_images else None
+        normalized_blur = list(map(normalize, blur_images)) if normalize else []
         
         # ブレスコア昇順でソート (スコアが低い=ブレが酷い を先頭に)
         normalized_blur.sort(key=lambda x: x[1])
         
         # ブレ画像データを保存 (選択時の参照用)
-        self.blur_items_data = {}
-        
-        for path, blur_score, face_count in normalized_blur:
-            # QListWidgetItem を作成
-            item = QListWidgetItem()
-            basename = os.path.basename(path)
-            label = f"{basename}\nブレ:{int(blur_score)}"
-            if face_count > 0:
-                label += f" 👤{face_count}"
-            item.setText(label)
-            item.setData(Qt.UserRole, path)  # パスをデータとして保存
-            item.setSizeHint(QSize(THUMBNAIL_SIZE + 20, THUMBNAIL_SIZE + 50))
-            
-            self.blur_list.addItem(item)
-            self.blur_items_data[path] = {"blur_score": blur_score, "face_count": face_count}
-            all_image_paths.append(path)
+        self.blur_items_data = {
+            path: {"blur_score": blur_score, "face_count": face_count}
+            for path, blur_score, face_count in normalized_blur
+        }
+        self._fill_blur_list(normalized_blur)
+        self._blur_paths = [path for path, _, _ in normalized_blur]
+        self._blur_sort_asc = True
+        self._blur_index = {path: i for i, path in enumerate(self._blur_paths)}
+        all_image_paths.extend(path for path, _, _ in normalized_blur)
         
         # 類似画像タブ (Phase 3形式: phash -> [(path, blur_score, face_count, size), ...])
+        # 選択状態だけ先に決め、ウィジェットはタブを開いたときに作る
         similar_groups = results.get("similar_groups", {})
-        for group_hash, group_items in similar_groups.items():
-            group_widget = self._create_group_widget(group_hash, group_items, image_metadata)
-            self.similar_layout.addWidget(group_widget)
-            # パスを抽出
-            for item in group_items:
-                if isinstance(item, (tuple, list)):
-                    all_image_paths.append(item[0])
-                elif isinstance(item, str):
-                    all_image_paths.append(item)
         self.similar_layout.addStretch()
+        self._queue_similar_groups(similar_groups, image_metadata)
         
-        # 重複動画タブ (グループ表示)
+        # 重複動画タブ (グループ表示、類似画像タブと同様に遅延生成)
         dup_videos = results.get("duplicate_videos", {})
-        for group_hash, group_items in dup_videos.items():
-            group_widget = self._create_video_group_widget(group_hash, group_items)
-            self.video_layout.addWidget(group_widget)
         self.video_layout.addStretch()
+        self._queue_video_groups(dup_videos)
         
         # 破損メディアタブ
         corrupted_files = results.get("corrupted_files", [])
-        for row, item in enumerate(corrupted_files):
-            if isinstance(item, (list, tuple)) and len(item) >= 2:
-                path, error_msg = item[0], item[1]
-            else:
-                continue
-            
-            self.corrupted_table.insertRow(row)
-            
-            # チェックボックス
-            checkbox = QCheckBox()
-            checkbox.stateChanged.connect(
-                lambda state, p=path, cb=checkbox: self._on_corrupted_check_changed(p, cb.isChecked())
-            )
-            self.corrupted_table.setCellWidget(row, 0, checkbox)
+        corrupted_rows = [item[:2] for item in corrupted_files
+                          if isinstance(item, (list, tuple)) and len(item) >= 2]
+        self.corrupted_table.setRowCount(len(corrupted_rows))
+        for row, (path, error_msg) in enumerate(corrupted_rows):
+            # チェックボックス (行ごとにウィジェットを作らずアイテムのチェック状態で表現)
+            check_item = QTableWidgetItem()
+            check_item.setFlags(Qt.ItemIsUserCheckable | Qt.ItemIsEnabled)
+            check_item.setCheckState(Qt.Unchecked)
+            check_item.setData(Qt.UserRole, path)
+            self.corrupted_table.setItem(row, 0, check_item)
             
             # ファイル情報
             filename = os.path.basename(path)
@@ -350,10 +429,10 @@ class ResultsView(QWidget):
         # タブタイトル更新
         blur_count = len(blur_images)
         corrupted_count = len(corrupted_files)
-        self.tabs.setTabText(0, f"ブレ画像 ({blur_count})")
-        self.tabs.setTabText(1, f"類似画像 ({len(similar_groups)}グループ)")
-        self.tabs.setTabText(2, f"重複動画 ({len(dup_videos)}グループ)")
-        self.tabs.setTabText(3, f"破損メディア ({corrupted_count})")
+        self.tabs.setTabText(TAB_BLUR, f"ブレ画像 ({blur_count})")
+        self.tabs.setTabText(TAB_SIMILAR, f"類似画像 ({len(similar_groups)}グループ)")
+        self.tabs.setTabText(TAB_VIDEO, f"重複動画 ({len(dup_videos)}グループ)")
+        self.tabs.setTabText(TAB_CORRUPTED, f"破損メディア ({corrupted_count})")
         
         # 非同期サムネイル読み込み開始
         if all_image_paths:
@@ -361,10 +440,146 @@ class ResultsView(QWidget):
         
         self._update_status()
     
-    def _create_group_widget(self, group_hash: str, group_items: list, image_metadata: dict = None) -> QWidget:
+    def _fill_blur_list(self, items: list):
+        """
+        ブレ画像リストにアイテムをまとめて追加
+        items: [(path, blur_score, face_count), ...]
+        追加中は再描画とシグナルを止め、レイアウト計算を最後の1回にまとめる
+        """
+        size_hint = QSize(THUMBNAIL_SIZE + 20, THUMBNAIL_SIZE + 50)
+        self.blur_list.setUpdatesEnabled(False)
+        self.blur_list.blockSignals(True)
+        try:
+            for path, blur_score, face_count in items:
+                item = QListWidgetItem()
+                basename = os.path.basename(path)
+                label = f"{basename}\nブレ:{int(blur_score)}"
+                if face_count > 0:
+                    label += f" 👤{face_count}"
+                item.setText(label)
+                item.setData(Qt.UserRole, path)  # パスをデータとして保存
+                item.setSizeHint(size_hint)
+                self.blur_list.addItem(item)
+                self._blur_item_by_path[path] = item
+        finally:
+            self.blur_list.blockSignals(False)
+            self.blur_list.setUpdatesEnabled(True)
+    
+    def _normalize_group_items(self, group_items: list, image_metadata: dict = None) -> list:
+        """類似画像グループの要素を [(path, blur_score, face_count, size), ...] に揃える"""
+        if not group_items:
+            return []
+        normalize = _group_item_normalizer(group_items[0], image_metadata)
+        return list(map(normalize, group_items)) if normalize else []
+    
+    def _queue_similar_groups(self, groups: dict, image_metadata: dict):
+        """
+        類似画像グループを選択状態に反映し、ウィジェット生成を保留する
+        Phase 3: スマートセレクト (ベストショット以外を削除候補に)
+        """
+        pending = []
+        for group_hash, group_items in groups.items():
+            normalized_items = self._normalize_group_items(group_items, image_metadata)
+            # ベストショットを選択 (削除しない1枚)
+            best_path = self._select_best_shot(normalized_items)
+            group_paths = [path for path, _, _, _ in normalized_items]
+            for path in group_paths:
+                self._path_to_group[path] = group_paths
+                if path != best_path:
+                    self.selected_files.add(path)
+            pending.append((group_hash, normalized_items, best_path))
+        self._pending_similar = pending
+        if self.tabs.currentIndex() == TAB_SIMILAR:
+            self._build_similar_batch()
+    
+    def _queue_video_groups(self, groups: dict):
+        """重複動画グループを選択状態に反映し、ウィジェット生成を保留する"""
+        pending = []
+        for group_hash, group_items in groups.items():
+            # データ形式を正規化
+            normalized_items = []
+            for item in group_items:
+                if isinstance(item, (list, tuple)) and len(item) >= 2:
+                    path, duration = item[0], item[1]
+                elif isinstance(item, (list, tuple)) and len(item) == 1:
+                    path = item[0]
+                    duration = None
+                elif isinstance(item, str):
+                    path = item
+                    duration = None
+                else:
+                    continue
+                normalized_items.append((path, duration, self._file_size(path)))
+            
+            # ベストを選択（サイズが最大のもの）、ベスト以外は削除候補にチェック
+            best_path = max(normalized_items, key=lambda x: x[2])[0] if normalized_items else ""
+            for path, _, _ in normalized_items:
+                if path != best_path:
+                    self.selected_files.add(path)
+            pending.append((group_hash, normalized_items, best_path))
+        self._pending_videos = pending
+        if self.tabs.currentIndex() == TAB_VIDEO:
+            self._build_video_batch()
+    
+    @Slot(int)
+    def _on_tab_changed(self, index: int):
+        """保留中のグループがあるタブを開いたときに生成を始め、表示範囲のサムネイルを読み込む"""
+        if index == TAB_BLUR:
+            self._scroll_timer.start()
+        elif index == TAB_SIMILAR:
+            if self._pending_similar:
+                self._build_similar_batch()
+            else:
+                self._similar_scroll_timer.start()
+        elif index == TAB_VIDEO and self._pending_videos:
+            self._build_video_batch()
+    
+    @Slot()
+    def _build_similar_batch(self):
+        """保留中の類似画像グループを GROUP_BUILD_BATCH 件ずつ生成 (残りは次のイベントで)"""
+        if not self._pending_similar:
+            return
+        batch = self._pending_similar[:GROUP_BUILD_BATCH]
+        del self._pending_similar[:GROUP_BUILD_BATCH]
+        paths = []
+        self.similar_content.setUpdatesEnabled(False)
+        try:
+            for group_hash, normalized_items, best_path in batch:
+                group_widget = self._create_group_widget(group_hash, normalized_items, best_path)
+                # 末尾のストレッチより前に追加
+                self.similar_layout.insertWidget(self.similar_layout.count() - 1, group_widget)
+                paths.extend(path for path, _, _, _ in normalized_items)
+        finally:
+            self.similar_content.setUpdatesEnabled(True)
+        # ブレ画像タブなどで読み込み済みの画像も新しいウィジェットに反映させる
+        # (読み込みはレイアウト確定後に表示範囲の分だけ行う)
+        self.loaded_thumbnails.difference_update(paths)
+        self._similar_scroll_timer.start()
+        if self._pending_similar:
+            QTimer.singleShot(0, self._build_similar_batch)
+    
+    @Slot()
+    def _build_video_batch(self):
+        """保留中の重複動画グループを GROUP_BUILD_BATCH 件ずつ生成"""
+        if not self._pending_videos:
+            return
+        batch = self._pending_videos[:GROUP_BUILD_BATCH]
+        del self._pending_videos[:GROUP_BUILD_BATCH]
+        self.video_content.setUpdatesEnabled(False)
+        try:
+            for group_hash, normalized_items, best_path in batch:
+                group_widget = self._create_video_group_widget(group_hash, normalized_items, best_path)
+                self.video_layout.insertWidget(self.video_layout.count() - 1, group_widget)
+        finally:
+            self.video_content.setUpdatesEnabled(True)
+        if self._pending_videos:
+            QTimer.singleShot(0, self._build_video_batch)
+    
+    def _create_group_widget(self, group_hash: str, normalized_items: list, best_path: str) -> QWidget:
         """
         類似画像グループを表示するウィジェット
-        Phase 3: スマートセレクト機能付き
+        normalized_items: [(path, blur_score, face_count, size), ...]
+        チェック状態は selected_files に従う (スマートセレクトは生成前に適用済み)
         """
         group = QFrame()
         group.setFrameStyle(QFrame.Box)
@@ -372,28 +587,6 @@ class ResultsView(QWidget):
         
         layout = QVBoxLayout(group)
         
-        # データ形式を正規化
-        normalized_items = []
-        for item in group_items:
-            if isinstance(item, (list, tuple)) and len(item) >= 4:
-                # Phase 3形式: (path, blur_score, face_count, size)
-                path, blur_score, face_count, size = item[0], item[1], item[2], item[3]
-                normalized_items.append((path, blur_score or 0, face_count or 0, size))
-            elif isinstance(item, (list, tuple)) and len(item) >= 2:
-                # 2要素の場合: (path, something) - pathとmetadataから取得
-                path = item[0]
-                if isinstance(path, str):
-                    meta = image_metadata.get(path, {}) if image_metadata else {}
-                    normalized_items.append((path, meta.get("blur_score", 0), meta.get("face_count", 0), meta.get("size", 0)))
-            elif isinstance(item, str):
-                # Phase 1形式: pathのみ
-                path = item
-                meta = image_metadata.get(path, {}) if image_metadata else {}
-                normalized_items.append((path, meta.get("blur_score", 0), meta.get("face_count", 0), meta.get("size", 0)))
-        
-        # ベストショットを選択 (削除しない1枚)
-        best_path = self._select_best_shot(normalized_items)
-        
         # グループヘッダー
         header = QLabel(f"グループ: {group_hash[:8]}... ({len(normalized_items)}枚)")
         header.setStyleSheet("font-weight: bold; border: none;")
@@ -412,25 +605,25 @@ class ResultsView(QWidget):
         
         for path, blur_score, face_count, size in normalized_items:
             widget = ThumbnailWidget(path, blur_score=blur_score, face_count=face_count)
+            # 初期状態の設定では集計を走らせないよう、シグナル接続の前にチェックする
+            if path in self.selected_files:
+                widget.set_checked(True)
             widget.checked_changed.connect(self._on_check_changed)
             widget.clicked.connect(self._on_thumbnail_clicked)
             thumb_layout.addWidget(widget)
             self.thumbnail_widgets[path] = widget
-            
-            # スマートセレクト: ベストショット以外は削除候補にチェック
-            if path != best_path:
-                widget.set_checked(True)
-                self.selected_files.add(path)
         
         thumb_layout.addStretch()
         scroll.setWidget(thumb_container)
         layout.addWidget(scroll)
         
+        self._group_members[group] = {path for path, _, _, _ in normalized_items}
         return group
     
-    def _create_video_group_widget(self, group_hash: str, group_items: list) -> QWidget:
+    def _create_video_group_widget(self, group_hash: str, normalized_items: list, best_path: str) -> QWidget:
         """
         重複動画グループを表示するウィジェット
+        normalized_items: [(path, duration, size), ...]
         """
         group = QFrame()
         group.setFrameStyle(QFrame.Box)
@@ -438,23 +631,6 @@ class ResultsView(QWidget):
         
         layout = QVBoxLayout(group)
         
-        # データ形式を正規化
-        normalized_items = []
-        for item in group_items:
-            if isinstance(item, (list, tuple)) and len(item) >= 2:
-                path, duration = item[0], item[1]
-            elif isinstance(item, (list, tuple)) and len(item) == 1:
-                path = item[0]
-                duration = None
-            elif isinstance(item, str):
-                path = item
-                duration = None
-            else:
-                continue
-            
-            size = os.path.getsize(path) if os.path.exists(path) else 0
-            normalized_items.append((path, duration, size))
-        
         # グループヘッダー
         header = QLabel(f"🎬 グループ: {group_hash[:16]}... ({len(normalized_items)}本)")
         header.setStyleSheet("font-weight: bold; border: none;")
@@ -471,21 +647,16 @@ class ResultsView(QWidget):
         card_layout = QHBoxLayout(card_container)
         card_layout.setSpacing(10)
         
-        # ベストを選択（サイズが最大のもの）
-        best_path = max(normalized_items, key=lambda x: x[2])[0] if normalized_items else ""
-        
         for path, duration, size in normalized_items:
             card = self._create_video_card(path, duration, size, is_best=(path == best_path))
             card_layout.addWidget(card)
-            
-            # ベスト以外は削除候補にチェック
-            if path != best_path:
-                self.selected_files.add(path)
+            self._video_cards[path] = card
         
         card_layout.addStretch()
         scroll.setWidget(card_container)
         layout.addWidget(scroll)
         
+        self._video_group_members[group] = {path for path, _, _ in normalized_items}
         return group
     
     def _create_video_card(self, path: str, duration: float, size: int, is_best: bool = False) -> QFrame:
@@ -523,11 +694,12 @@ class ResultsView(QWidget):
         # チェックボックス
         checkbox = QCheckBox("削除対象" if not is_best else "✓ ベスト (保持)")
         checkbox.setStyleSheet("border: none;")
-        checkbox.setChecked(not is_best)
+        checkbox.setChecked(path in self.selected_files)
         checkbox.stateChanged.connect(
             lambda state, p=path, cb=checkbox: self._on_video_check_changed(p, cb.isChecked())
         )
         layout.addWidget(checkbox)
+        self._video_checkboxes[path] = checkbox
         
         return card
     
@@ -549,14 +721,8 @@ class ResultsView(QWidget):
         if not items:
             return ""
         
-        # ソート: 顔数降順 → blur_score降順 → サイズ降順
-        sorted_items = sorted(
-            items,
-            key=lambda x: (x[2], x[1], x[3]),  # face_count, blur_score, size
-            reverse=True
-        )
-        
-        return sorted_items[0][0]  # ベストショットのパスを返す
+        # 顔数 → blur_score → サイズ が最大のもの (同点なら先頭) を1回の走査で選ぶ
+        return max(items, key=lambda x: (x[2], x[1], x[3]))[0]
     
     def _start_thumbnail_loading(self, paths: list):
         """
@@ -570,74 +736,115 @@ class ResultsView(QWidget):
         self.pending_thumbnail_paths = list(paths)
         self.loaded_thumbnails = set()
         
-        # 全画像を読み込み (類似画像も含めて)
-        self._load_thumbnail_batch(paths)
-        
-        # スクロールイベントで追加読み込み（blur_list用）
-        try:
-            self.blur_list.verticalScrollBar().valueChanged.disconnect(self._on_blur_scroll)
-        except:
-            pass
-        self.blur_list.verticalScrollBar().valueChanged.connect(self._on_blur_scroll)
+        # 最初の読み込みはレイアウト確定後に可視範囲の分だけ
+        self._scroll_timer.start()
     
+    def _visible_blur_rows(self) -> range:
+        """
+        ブレ画像リストの可視範囲 (前後 SCROLL_PREFETCH 件を含む) の行番号
+        全アイテムの矩形を調べず、表示領域の上端/下端の位置から求める
+        """
+        count = self.blur_list.count()
+        if count == 0:
+            return range(0)
+        rect = self.blur_list.viewport().rect()
+        # アイテム間の余白に当たった場合は余白分ずらして再検索
+        gap = self.blur_list.spacing() * 2 + 1
+        
+        def row_at(xs, ys):
+            for x in xs:
+                for y in ys:
+                    row = self.blur_list.indexAt(QPoint(x, y)).row()
+                    if row >= 0:
+                        return row
+            return -1
+        
+        first = row_at((gap,), (rect.top(), rect.top() + gap))
+        # 折り返し表示では下端の行の右端が最大の行番号になる
+        # 右端が行末の余白や途中で終わる最終行の空き部分なら、アイテム幅の半分ずつ左へずらして探す
+        step = max(1, self.blur_list.visualItemRect(self.blur_list.item(0)).width() // 2)
+        last = row_at([*range(rect.right() - gap, gap, -step), gap], (rect.bottom(), rect.bottom() - gap))
+        if first < 0:
+            first = 0
+        if last < 0:
+            last = count - 1
+        return range(max(0, first - SCROLL_PREFETCH), min(count, last + SCROLL_PREFETCH + 1))
+    
+    @Slot()
     def _on_blur_scroll(self):
         """スクロール時に可視範囲のサムネイルを読み込み"""
         if not hasattr(self, 'pending_thumbnail_paths'):
             return
         
-        # 可視範囲のアイテムを取得
-        visible_rect = self.blur_list.viewport().rect()
+        # 可視範囲のアイテムを取得 (読み込み待ちはこの範囲に差し替わる)
         to_load = []
-        
-        for i in range(self.blur_list.count()):
-            item = self.blur_list.item(i)
-            item_rect = self.blur_list.visualItemRect(item)
-            
-            if visible_rect.intersects(item_rect):
-                path = item.data(Qt.UserRole)
-                if path and path not in self.loaded_thumbnails:
-                    to_load.append(path)
-        
-        # バッチ読み込み
-        if to_load:
-            self._load_thumbnail_batch(to_load[:20])  # 最大20件ずつ
+        for i in self._visible_blur_rows():
+            path = self.blur_list.item(i).data(Qt.UserRole)
+            if path:
+                to_load.append(path)
+        self._load_thumbnail_batch(to_load)
+    
+    @Slot()
+    def _on_similar_scroll(self):
+        """類似画像タブの表示範囲 (前後 SCROLL_PREFETCH 行分を含む) にあるグループのサムネイルを読み込み"""
+        bar = self.similar_scroll.verticalScrollBar()
+        margin = SCROLL_PREFETCH * THUMBNAIL_SIZE
+        top = bar.value() - margin
+        bottom = bar.value() + self.similar_scroll.viewport().height() + margin
+        to_load = []
+        for group, members in self._group_members.items():
+            geometry = group.geometry()
+            if geometry.bottom() >= top and geometry.top() <= bottom:
+                to_load.extend(members)
+        self._load_thumbnail_batch(to_load)
     
     def _load_thumbnail_batch(self, paths: list):
-        """サムネイルをバッチで読み込み"""
-        if not paths:
-            return
-        
-        # 読み込み済みを除外
-        paths_to_load = [p for p in paths if p not in self.loaded_thumbnails]
-        if not paths_to_load:
-            return
-        
-        # 読み込み済みとしてマーク
-        for p in paths_to_load:
-            self.loaded_thumbnails.add(p)
-        
-        # ローダーを開始
+        """
+        表示範囲のサムネイルを読み込み
+        ローダーは1つだけ常駐させ、読み込み待ちを paths のうち未読み込みのものに差し替える
+        """
+        # 読み込み済みを除外し、キャッシュにあるものはその場で反映
+        paths_to_load = []
+        for p in paths:
+            if p in self.loaded_thumbnails:
+                if p in self._queued_thumbnails:
+                    paths_to_load.append(p)  # 読み込み待ちのまま残す
+                continue
+            self.loaded_thumbnails.add(p)  # 読み込み済みとしてマーク
+            pixmap = self._get_cached_thumbnail(p)
+            if pixmap is not None:
+                self._on_thumbnail_loaded(p, pixmap)
+            else:
+                paths_to_load.append(p)
+                self._queued_thumbnails.add(p)
+        if self.loader is None:
+            if not paths_to_load:
+                return
+            self._start_loader()
+        
+        # 表示範囲から外れて読み込まれなかったパスは、再び表示されたときに読み込めるよう戻す
+        for p in self.loader.request(paths_to_load):
+            self.loaded_thumbnails.discard(p)
+            self._queued_thumbnails.discard(p)
+    
+    def _start_loader(self):
+        """常駐するサムネイルローダーを開始"""
         self.loader_thread = QThread(self)  # 親をセットしてクラッシュ防止
-        self.loader = ThumbnailLoader(paths_to_load)
+        self.loader = ThumbnailLoader()
         self.loader.moveToThread(self.loader_thread)
         
         # シグナル接続
         self.loader_thread.started.connect(self.loader.run)
-        self.loader.loaded.connect(self._on_thumbnail_loaded)
+        self.loader.loaded_batch.connect(self._on_thumbnails_loaded)
         self.loader.failed.connect(self._on_thumbnail_failed)
         
-        # スレッド終了処理
+        # スレッド終了処理 (参照の破棄は _stop_loader で行う)
         self.loader.finished.connect(self.loader_thread.quit)
         self.loader.finished.connect(self.loader.deleteLater)
-        self.loader_thread.finished.connect(self._on_loader_finished)
+        self.loader_thread.finished.connect(self.loader_thread.deleteLater)
         
         self.loader_thread.start()
     
-    def _on_loader_finished(self):
-        """ローダースレッド完了時"""
-        self.loader = None
-        self.loader_thread = None
-    
     def _stop_loader(self):
         """サムネイルローダーを停止"""
         if self.loader:
@@ -645,27 +852,70 @@ class ResultsView(QWidget):
         if self.loader_thread and self.loader_thread.isRunning():
             self.loader_thread.quit()
             self.loader_thread.wait(3000)  # 最大3秒待機
-            if self.loader_thread and self.loader_thread.isRunning():
+            if self.loader_thread.isRunning():
                 self.loader_thread.terminate()  # 強制終了
+        self.loader = None
+        self.loader_thread = None
+        # 届かなかった分は次に表示されたときに読み込み直す
+        self.loaded_thumbnails.difference_update(self._queued_thumbnails)
+        self._queued_thumbnails.clear()
+    
+    def _thumbnail_key(self, path: str):
+        """
+        キャッシュキー (再スキャンでファイルの更新が分かれば別のキーになる)
+        GUIスレッドで stat しないよう、スキャン時の更新日時/サイズを使う
+        """
+        meta = self.scan_results.get("image_metadata", {}).get(path)
+        if meta is None or meta.get("mtime") is None:
+            return None
+        return path, meta["mtime"], meta.get("size", 0)
+    
+    def _get_cached_thumbnail(self, path: str):
+        """キャッシュ済みのサムネイル (なければ None)"""
+        key = self._thumbnail_key(path)
+        pixmap = self._thumbnail_cache.get(key)
+        if pixmap is not None:
+            self._thumbnail_cache.move_to_end(key)
+        return pixmap
+    
+    def _cache_thumbnail(self, path: str, pixmap: QPixmap):
+        key = self._thumbnail_key(path)
+        if key is None:
+            return
+        cache = self._thumbnail_cache
+        cache[key] = pixmap
+        cache.move_to_end(key)
+        while len(cache) > THUMBNAIL_CACHE_SIZE:
+            cache.popitem(last=False)
+    
+    @Slot(list)
+    def _on_thumbnails_loaded(self, batch: list):
+        """サムネイルの読み込み結果 (QImage) をまとめて反映 (再描画は最後の1回)"""
+        self.setUpdatesEnabled(False)
+        try:
+            for path, image in batch:
+                self._queued_thumbnails.discard(path)
+                self._on_thumbnail_loaded(path, QPixmap.fromImage(image))
+        finally:
+            self.setUpdatesEnabled(True)
     
-    @Slot(str, QPixmap)
     def _on_thumbnail_loaded(self, path: str, pixmap: QPixmap):
-        """サムネイル読み込み完了時"""
+        """サムネイル1件の読み込み完了時"""
+        self._cache_thumbnail(path, pixmap)
+        
         # ThumbnailWidget (類似画像タブ用)
         if path in self.thumbnail_widgets:
             self.thumbnail_widgets[path].set_pixmap(pixmap)
         
         # QListWidget (ブレ画像タブ用)
-        for i in range(self.blur_list.count()):
-            item = self.blur_list.item(i)
-            if item and item.data(Qt.UserRole) == path:
-                # アイコンとして設定
-                item.setIcon(QIcon(pixmap))
-                break
+        item = self._blur_item_by_path.get(path)
+        if item is not None:
+            item.setIcon(QIcon(pixmap))
     
     @Slot(str)
     def _on_thumbnail_failed(self, path: str):
         """サムネイル読み込み失敗時"""
+        self._queued_thumbnails.discard(path)
         # ThumbnailWidget (類似画像タブ用)
         if path in self.thumbnail_widgets:
             self.thumbnail_widgets[path].set_error()
@@ -686,6 +936,12 @@ class ResultsView(QWidget):
             self.selected_files.discard(path)
         self._update_status()
     
+    @Slot(QTableWidgetItem)
+    def _on_corrupted_item_changed(self, item: QTableWidgetItem):
+        """破損メディアテーブルの選択列のチェック状態変更時"""
+        if item.column() == 0:
+            self._on_corrupted_check_changed(item.data(Qt.UserRole), item.checkState() == Qt.Checked)
+    
     def _on_corrupted_check_changed(self, path: str, checked: bool):
         """破損メディアテーブルのチェックボックス変更時"""
         if checked:
@@ -696,17 +952,11 @@ class ResultsView(QWidget):
     
     def _on_blur_list_selection_changed(self):
         """ブレ画像リストの選択変更時"""
-        # 選択されたアイテムのパスを取得
-        for item in self.blur_list.selectedItems():
-            path = item.data(Qt.UserRole)
-            if path:
-                self.selected_files.add(path)
-        
-        # 選択解除されたアイテムを削除
+        # 選択解除されたアイテムを除き、選択されたアイテムを追加
+        # (全パスの集合は読み込み時の _blur_index を使い、毎回作り直さない)
         selected_paths = {item.data(Qt.UserRole) for item in self.blur_list.selectedItems()}
-        blur_paths = {self.blur_list.item(i).data(Qt.UserRole) for i in range(self.blur_list.count())}
-        for path in blur_paths - selected_paths:
-            self.selected_files.discard(path)
+        self.selected_files.difference_update(self._blur_index.keys() - selected_paths)
+        self.selected_files.update(selected_paths)
         
         self._update_status()
     
@@ -727,51 +977,46 @@ class ResultsView(QWidget):
         """ブレ画像のソート順を切り替え"""
         if not hasattr(self, 'blur_items_data') or not self.blur_items_data:
             return
-        
-        # ソートを実行
-        items_with_score = [
-            (path, data.get("blur_score", 0), data.get("face_count", 0))
-            for path, data in self.blur_items_data.items()
-        ]
-        items_with_score.sort(key=lambda x: x[1], reverse=not ascending)
-        
-        # リストを再構築
-        self.blur_list.clear()
-        for path, blur_score, face_count in items_with_score:
-            item = QListWidgetItem()
-            basename = os.path.basename(path)
-            label = f"{basename}\nブレ:{int(blur_score)}"
-            if face_count > 0:
-                label += f" 👤{face_count}"
-            item.setText(label)
-            item.setData(Qt.UserRole, path)
-            item.setSizeHint(QSize(THUMBNAIL_SIZE + 20, THUMBNAIL_SIZE + 50))
-            self.blur_list.addItem(item)
-        
-        # サムネイル再読み込み
-        paths = [path for path, _, _ in items_with_score]
-        self._start_thumbnail_loading(paths)
+        if ascending == self._blur_sort_asc:
+            return  # 既に同じ並び順
+        
+        # 読み込み時にソート済みなので、逆順にするだけでよい
+        self._blur_sort_asc = ascending
+        self._blur_paths.reverse()
+        self._blur_index = {path: i for i, path in enumerate(self._blur_paths)}
+        
+        # アイテムを作り直さずに並べ替える (読み込み済みのアイコンもそのまま残る)
+        blur_list = self.blur_list
+        selected = blur_list.selectedItems()
+        blur_list.setUpdatesEnabled(False)
+        blur_list.blockSignals(True)
+        try:
+            # 末尾から取り出すと逆順のリストになる
+            items = [blur_list.takeItem(row) for row in range(blur_list.count() - 1, -1, -1)]
+            for item in items:
+                blur_list.addItem(item)
+            for item in selected:
+                item.setSelected(True)
+        finally:
+            blur_list.blockSignals(False)
+            blur_list.setUpdatesEnabled(True)
     
     def _on_thumbnail_clicked(self, path: str):
         """サムネイルクリック時 - 比較モードを開く"""
         # 同じグループ内の別の画像を探す
-        similar_groups = self.scan_results.get("similar_groups", {})
-        for group_hash, paths in similar_groups.items():
-            if path in paths:
-                # 同グループ内で別の画像を選ぶ
-                other_paths = [p for p in paths if p != path]
-                if other_paths:
-                    self._open_compare_mode(path, other_paths[0])
-                    return
+        for other in self._path_to_group.get(path, ()):
+            if other != path:
+                self._open_compare_mode(path, other)
+                return
         
         # 類似グループにない場合はブレ画像タブから
-        blur_images = self.scan_results.get("blur_images", [])
-        if path in blur_images:
-            idx = blur_images.index(path)
-            if idx + 1 < len(blur_images):
-                self._open_compare_mode(path, blur_images[idx + 1])
+        idx = self._blur_index.get(path)
+        if idx is not None:
+            blur_paths = self._blur_paths
+            if idx + 1 < len(blur_paths):
+                self._open_compare_mode(path, blur_paths[idx + 1])
             elif idx > 0:
-                self._open_compare_mode(blur_images[idx - 1], path)
+                self._open_compare_mode(blur_paths[idx - 1], path)
     
     def _open_compare_mode(self, left_path: str, right_path: str):
         """比較モードを開く"""
@@ -784,12 +1029,14 @@ class ResultsView(QWidget):
         left_blur = left_meta.get("blur_score")
         right_blur = right_meta.get("blur_score")
         
-        self.compare_widget.set_images(left_path, right_path, left_blur, right_blur)
-        self.content_stack.setCurrentWidget(self.compare_widget)
+        # サイズもスキャン時の値を渡す (比較表示のたびに stat しない)
+        self.compare_widget.set_images(left_path, right_path, left_blur, right_blur,
+                                       left_meta.get("size"), right_meta.get("size"))
+        self.content_stack.setCurrentIndex(PAGE_COMPARE)
     
     def _close_compare_mode(self):
         """比較モードを閉じる"""
-        self.content_stack.setCurrentWidget(self.tabs)
+        self.content_stack.setCurrentIndex(PAGE_TABS)
     
     def _add_to_delete(self, path: str):
         """削除対象に追加"""
@@ -798,44 +1045,61 @@ class ResultsView(QWidget):
         self.selected_files.add(path)
         self._update_status()
     
+    def _set_all_checked(self, checked: bool):
+        """
+        類似画像/重複動画のチェックを一括変更
+        個々の変更通知は止め、選択状態の更新と集計は最後に1回だけ行う
+        """
+        for widget in self.thumbnail_widgets.values():
+            widget.blockSignals(True)
+            widget.set_checked(checked)
+            widget.blockSignals(False)
+        for checkbox in self._video_checkboxes.values():
+            checkbox.blockSignals(True)
+            checkbox.setChecked(checked)
+            checkbox.blockSignals(False)
+    
     def _select_all(self):
         """すべて選択"""
-        for path, widget in self.thumbnail_widgets.items():
-            widget.set_checked(True)
-            self.selected_files.add(path)
-        
-        # 動画テーブル
-        for row in range(self.video_table.rowCount()):
-            checkbox = self.video_table.cellWidget(row, 0)
-            if checkbox:
-                checkbox.setChecked(True)
-        
+        self._set_all_checked(True)
+        self.selected_files.update(self.thumbnail_widgets)
+        self.selected_files.update(self._video_checkboxes)
+        # 未生成のグループも対象に含める
+        for _, items, _ in self._pending_similar:
+            self.selected_files.update(path for path, _, _, _ in items)
+        for _, items, _ in self._pending_videos:
+            self.selected_files.update(path for path, _, _ in items)
         self._update_status()
     
     def _deselect_all(self):
         """すべて解除"""
-        for path, widget in self.thumbnail_widgets.items():
-            widget.set_checked(False)
-        
-        for row in range(self.video_table.rowCount()):
-            checkbox = self.video_table.cellWidget(row, 0)
-            if checkbox:
-                checkbox.setChecked(False)
-        
+        self._set_all_checked(False)
         self.selected_files.clear()
         self._update_status()
     
     def _update_status(self):
         """ステータスバー更新"""
         count = len(self.selected_files)
-        total_size = 0
-        for path in self.selected_files:
-            if os.path.exists(path):
-                total_size += os.path.getsize(path)
+        # メタデータにないファイルだけ先にサイズを調べ、合計は辞書の参照のみで求める
+        sizes = self._size_cache
+        for path in self.selected_files - sizes.keys():
+            self._file_size(path)
+        total_size = sum(map(sizes.__getitem__, self.selected_files))
         
         size_str = self._format_size(total_size)
         self.status_label.setText(f"選択中: {count}枚 / 合計サイズ: {size_str}")
     
+    def _file_size(self, path: str) -> int:
+        """ファイルサイズ (キャッシュになければ stat して記録)"""
+        size = self._size_cache.get(path)
+        if size is None:
+            try:
+                size = os.path.getsize(path)
+            except OSError:
+                size = 0
+            self._size_cache[path] = size
+        return size
+    
     def _delete_selected(self):
         """選択ファイルをゴミ箱へ移動"""
         if not self.selected_files:
@@ -852,31 +1116,37 @@ class ResultsView(QWidget):
         if reply != QMessageBox.Yes:
             return
         
+        from send2trash import send2trash  # 削除時のみ必要なため遅延読み込み
+        
         success = 0
         failed = 0
         deleted_paths = []
         
-        for path in list(self.selected_files):
-            try:
-                # Windowsパスを正規化 (スラッシュの混在を解消)
-                normalized_path = os.path.normpath(path)
-                send2trash(normalized_path)
+        # ゴミ箱への移動はスレッドで並行実行し、ウィジェットの更新は完了後にGUIスレッドで行う
+        with ThreadPoolExecutor(max_workers=DELETE_WORKERS) as executor:
+            # Windowsパスを正規化 (スラッシュの混在を解消)
+            futures = {executor.submit(send2trash, os.path.normpath(path)): path
+                       for path in self.selected_files}
+            for future in as_completed(futures):
+                path = futures[future]
+                try:
+                    future.result()
+                except Exception as e:
+                    failed += 1
+                    print(f"削除エラー: {path} - {e}")
+                    continue
                 success += 1
                 deleted_paths.append(path)
-                
-                # サムネイルウィジェットから削除
-                if path in self.thumbnail_widgets:
-                    widget = self.thumbnail_widgets.pop(path)
-                    widget.deleteLater()
-                self.selected_files.discard(path)
-            except Exception as e:
-                failed += 1
-                print(f"削除エラー: {path} - {e}")
-        
-        # 動画テーブルから削除されたファイルを除去
-        self._remove_from_video_table(deleted_paths)
-        
-        # 類似画像グループの空グループを削除
+        
+        for path in deleted_paths:
+            # サムネイルウィジェットから削除
+            widget = self.thumbnail_widgets.pop(path, None)
+            if widget is not None:
+                widget.deleteLater()
+            self.selected_files.discard(path)
+        
+        # グループから削除されたファイルを除去し、空グループを削除
+        self._remove_from_groups(deleted_paths)
         self._cleanup_empty_groups()
         
         self._update_status()
@@ -885,60 +1155,72 @@ class ResultsView(QWidget):
             f"ゴミ箱へ移動: {success}個\n失敗: {failed}個"
         )
     
-    def _remove_from_video_table(self, deleted_paths: list):
-        """動画テーブルから削除されたパスの行を除去"""
-        rows_to_remove = []
-        for row in range(self.video_table.rowCount()):
-            path_item = self.video_table.item(row, 3)
-            if path_item and path_item.text() in deleted_paths:
-                rows_to_remove.append(row)
-        
-        # 後ろから削除 (インデックスずれ防止)
-        for row in reversed(rows_to_remove):
-            self.video_table.removeRow(row)
+    def _remove_from_groups(self, deleted_paths: list):
+        """類似画像/重複動画グループから削除されたパスを除去"""
+        deleted = set(deleted_paths)
+        # 閾値変更時の再グルーピング対象からも外す
+        image_metadata = self.scan_results.get("image_metadata", {})
+        for path in deleted:
+            image_metadata.pop(path, None)
+            card = self._video_cards.pop(path, None)
+            if card is not None:
+                card.deleteLater()
+            self._video_checkboxes.pop(path, None)
+            # グループのパスリストは全メンバーで共有しているので1回除けばよい
+            group_paths = self._path_to_group.pop(path, None)
+            if group_paths is not None and path in group_paths:
+                group_paths.remove(path)
+        for members in self._group_members.values():
+            members.difference_update(deleted)
+        for members in self._video_group_members.values():
+            members.difference_update(deleted)
+        
+        # 未生成のグループからも除き、1件以下になったものは作らない
+        pending = []
+        for group_hash, items, best_path in self._pending_similar:
+            items = [item for item in items if item[0] not in deleted]
+            if len(items) > 1:
+                pending.append((group_hash, items, best_path))
+        self._pending_similar = pending
+        pending = []
+        for group_hash, items, best_path in self._pending_videos:
+            items = [item for item in items if item[0] not in deleted]
+            if len(items) > 1:
+                pending.append((group_hash, items, best_path))
+        self._pending_videos = pending
     
     def _cleanup_empty_groups(self):
-        """類似画像タブの空グループ (1枚以下) を削除"""
-        # similar_layoutから子ウィジェットを走査
-        widgets_to_remove = []
-        for i in range(self.similar_layout.count()):
-            item = self.similar_layout.itemAt(i)
-            if item and item.widget():
-                group_widget = item.widget()
-                # グループ内のサムネイル数をカウント
-                remaining_count = self._count_group_thumbnails(group_widget)
-                if remaining_count <= 1:
-                    widgets_to_remove.append(group_widget)
-        
-        # 削除
-        for widget in widgets_to_remove:
-            widget.deleteLater()
+        """類似画像/重複動画タブの空グループ (1件以下) を削除"""
+        for members_by_group in (self._group_members, self._video_group_members):
+            for group, members in list(members_by_group.items()):
+                if len(members) <= 1:
+                    del members_by_group[group]
+                    group.deleteLater()
     
-    def _count_group_thumbnails(self, group_widget) -> int:
-        """グループウィジェット内の残りサムネイル数をカウント"""
-        count = 0
-        # QFrameの中のQScrollAreaを探す
-        for child in group_widget.findChildren(ThumbnailWidget):
-            if child.isVisible() and child.file_path in self.thumbnail_widgets:
-                count += 1
-        return count
-    
-    def _format_size(self, size: int) -> str:
-        """ファイルサイズを読みやすい形式に"""
+    @staticmethod
+    @functools.lru_cache(maxsize=4096)
+    def _format_size(size: int) -> str:
+        """ファイルサイズを読みやすい形式に (同じサイズの表示が多いためメモ化)"""
         for unit in ['B', 'KB', 'MB', 'GB']:
             if size < 1024:
                 return f"{size:.1f} {unit}"
             size /= 1024
         return f"{size:.1f} TB"
     
-    def _clear_layout(self, layout):
-        """レイアウト内のウィジェットをクリア"""
-        while layout.count():
-            item = layout.takeAt(0)
-            if item.widget():
-                item.widget().deleteLater()
-            elif item.layout():
-                self._clear_layout(item.layout())
+    def _reset_similar_content(self):
+        """
+        類似画像タブの中身を新しいウィジェットに差し替える
+        古い中身は QScrollArea.setWidget が子ウィジェットごとまとめて破棄する
+        """
+        self.similar_content = QWidget()
+        self.similar_layout = QVBoxLayout(self.similar_content)
+        self.similar_scroll.setWidget(self.similar_content)
+    
+    def _reset_video_content(self):
+        """重複動画タブの中身を新しいウィジェットに差し替える"""
+        self.video_content = QWidget()
+        self.video_layout = QVBoxLayout(self.video_content)
+        self.video_scroll.setWidget(self.video_content)
     
     def closeEvent(self, event):
         """クローズ時にローダーを停止"""
@@ -947,13 +1229,25 @@ class ResultsView(QWidget):
 
     def _on_threshold_changed(self, value: int):
         """類似度閾値スライダー変更時"""
-        if value == 0:
+        self._update_threshold_label(value)
+        self._threshold_timer.start()
+    
+    def _scan_similar_distance(self) -> int:
+        """スキャン時に類似グループをまとめたハミング距離"""
+        return self.scan_results.get("similar_distance", DEFAULT_SIMILAR_DISTANCE)
+    
+    def _update_threshold_label(self, value: int):
+        if value == self._scan_similar_distance():
+            self.threshold_label.setText(f"{value} (標準)")
+        elif value == 0:
             self.threshold_label.setText("0 (完全一致)")
         else:
             self.threshold_label.setText(f"{value} (類似)")
-        
-        # 再グルーピング
-        self._recalculate_groups(value)
+    
+    @Slot()
+    def _apply_threshold(self):
+        """スライダー確定後に再グルーピング"""
+        self._recalculate_groups(self.threshold_slider.value())
     
     def _recalculate_groups(self, threshold: int):
         """pHashのハミング距離に基づいて類似画像を再グルーピング"""
@@ -962,67 +1256,36 @@ class ResultsView(QWidget):
         
         image_metadata = self.scan_results.get("image_metadata", {})
         
-        # pHashを持つ画像を収集
-        images_with_phash = []
-        for path, meta in image_metadata.items():
-            if os.path.exists(path):
-                # DBからpHashを取得する必要があるが、ここでは簡易実装
-                images_with_phash.append((path, meta))
-        
-        if threshold == 0:
-            # 完全一致モード: 元のグルーピングを復元
+        if threshold == self._scan_similar_distance():
+            # 標準モード: スキャン時のグルーピングを復元
             original_groups = self.scan_results.get("similar_groups", {})
             self._rebuild_similar_groups(original_groups, image_metadata)
         else:
             # ハミング距離によるグルーピング
-            try:
-                import imagehash
-                from PIL import Image
-                
-                # pHashを計算しながらグルーピング
-                phash_map = {}
-                for path, meta in images_with_phash:
-                    try:
-                        img = Image.open(path)
-                        phash = imagehash.phash(img)
-                        phash_map[path] = (phash, meta)
-                    except:
-                        pass
-                
-                # ハミング距離でグルーピング
-                grouped = {}
-                used = set()
-                
-                paths = list(phash_map.keys())
-                for i, p1 in enumerate(paths):
-                    if p1 in used:
-                        continue
-                    
-                    group = [(p1, phash_map[p1][1].get("blur_score", 0),
-                             phash_map[p1][1].get("face_count", 0),
-                             phash_map[p1][1].get("size", 0))]
-                    used.add(p1)
-                    
-                    for p2 in paths[i+1:]:
-                        if p2 in used:
-                            continue
-                        
-                        # ハミング距離計算
-                        dist = phash_map[p1][0] - phash_map[p2][0]
-                        if dist <= threshold:
-                            group.append((p2, phash_map[p2][1].get("blur_score", 0),
-                                         phash_map[p2][1].get("face_count", 0),
-                                         phash_map[p2][1].get("size", 0)))
-                            used.add(p2)
-                    
-                    if len(group) > 1:
-                        group_key = f"group_{i}"
-                        grouped[group_key] = group
-                
-                self._rebuild_similar_groups(grouped, image_metadata)
-                
-            except ImportError:
-                pass
+            # pHash はスキャン時に image_metadata に保持済みのため画像を開き直さない
+            import numpy as np
+            from core.similarity import cluster_hash_array
+            
+            paths = []
+            metas = []
+            hash_values = []
+            for path, meta in image_metadata.items():
+                phash = meta.get("phash")
+                if phash is not None:
+                    paths.append(path)
+                    metas.append(meta)
+                    hash_values.append(phash)
+            # 符号付き64bitのまま詰めて符号なしとして再解釈
+            hashes = np.array(hash_values, dtype=np.int64).view(np.uint64)
+            
+            # ハミング距離でグルーピング (スキャン時と同じく推移的にまとめる)
+            grouped = {}
+            for members in cluster_hash_array(hashes, threshold):
+                grouped[f"group_{members[0]}"] = [(paths[j], metas[j].get("blur_score", 0),
+                                                   metas[j].get("face_count", 0),
+                                                   metas[j].get("size", 0)) for j in members]
+            
+            self._rebuild_similar_groups(grouped, image_metadata)
     
     def _rebuild_similar_groups(self, groups: dict, image_metadata: dict):
         """類似画像グループを再構築"""
@@ -1040,7 +1303,7 @@ class ResultsView(QWidget):
                     parent = parent.parent() if hasattr(parent, 'parent') else None
         
         # similar_layoutをクリア
-        self._clear_layout(self.similar_layout)
+        self._reset_similar_content()
         
         # ウィジェット参照を削除
         for path in similar_widgets:
@@ -1048,26 +1311,14 @@ class ResultsView(QWidget):
                 del self.thumbnail_widgets[path]
         
         self.selected_files.clear()
+        self._path_to_group = {}
+        self._group_members = {}
         
-        # 新しいグループを構築
-        all_image_paths = []
-        for group_hash, group_items in groups.items():
-            group_widget = self._create_group_widget(group_hash, group_items, image_metadata)
-            self.similar_layout.addWidget(group_widget)
-            
-            for item in group_items:
-                if isinstance(item, tuple):
-                    all_image_paths.append(item[0])
-                else:
-                    all_image_paths.append(item)
-        
+        # 新しいグループを構築 (表示中のタブなので順次生成される)
         self.similar_layout.addStretch()
+        self._queue_similar_groups(groups, image_metadata)
         
         # タブタイトル更新
-        self.tabs.setTabText(1, f"類似画像 ({len(groups)}グループ)")
-        
-        # サムネイル再読み込み
-        if all_image_paths:
-            self._start_thumbnail_loading(all_image_paths)
+        self.tabs.setTabText(TAB_SIMILAR, f"類似画像 ({len(groups)}グループ)")
         
         self._update_status()
@@ -0,0 +1,16 @@
+"""
+settings.py - SmartMediaCleaner
+スキャン/表示設定
+"""
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class ScanSettings:
+    """
+    スキャン設定 (不変)
+    変更時は SettingsDialog.get_settings() で新しいインスタンスを作るため、コピーは不要
+    """
+    blur_threshold: float = 100.0
+    recursive: bool = True
+    blur_sort_asc: bool = True
@@ -2,15 +2,20 @@
 video_preview.py - SmartMediaCleaner Phase 4
 動画プレビュー機能 (ホバー再生、シークバー)
 """
+import os
+import threading
+from typing import Optional
 import cv2
 import numpy as np
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
     QPushButton, QSlider, QFrame
 )
-from PySide6.QtCore import Qt, Signal, QTimer, QSize
+from PySide6.QtCore import Qt, Signal, QTimer, QSize, QObject, QRunnable, QThreadPool
 from PySide6.QtGui import QPixmap, QImage
 
+from .components import THUMBNAIL_SIZE, thumbnail_cache_dir, thumbnail_cache_path
+
 
 class VideoPreviewWidget(QWidget):
     """
@@ -19,7 +24,7 @@ class VideoPreviewWidget(QWidget):
     - シークバーで任意位置へジャンプ
     """
     
-    def __init__(self, video_path: str, parent=None):
+    def __init__(self, video_path: str = "", parent=None):
         super().__init__(parent)
         self.video_path = video_path
         self.cap = None
@@ -27,13 +32,39 @@ class VideoPreviewWidget(QWidget):
         self.fps = 0
         self.current_frame = 0
         self.is_playing = False
-        
-        self._init_ui()
-        self._init_video()
+        # デコード先のバッファ (フレームごとに確保し直さない)
+        self._frame_buf = None
         
         # 再生タイマー (5fps = 200ms間隔)
-        self.timer = QTimer()
+        self.timer = QTimer(self)
         self.timer.timeout.connect(self._next_frame)
+        
+        self._init_ui()
+        self._init_video()
+    
+    def release(self):
+        """
+        再生を止めて動画ファイルを閉じる
+        開いたままだと Windows ではそのファイルを削除 (ゴミ箱へ移動) できない
+        """
+        self.stop_preview()
+        if self.cap:
+            self.cap.release()
+            self.cap = None
+    
+    def set_video(self, video_path: str):
+        """表示する動画を差し替え (ウィジェットとタイマーはそのまま再利用)"""
+        self.release()
+        self.video_path = video_path
+        self.frame_count = 0
+        self.fps = 0
+        self.current_frame = 0
+        self.preview_label.clear()
+        self.time_label.setText("00:00")
+        self.seek_slider.blockSignals(True)
+        self.seek_slider.setValue(0)
+        self.seek_slider.blockSignals(False)
+        self._init_video()
     
     def _init_ui(self):
         """UI初期化"""
@@ -78,12 +109,16 @@ class VideoPreviewWidget(QWidget):
     
     def _init_video(self):
         """動画ファイルを開く"""
+        if not self.video_path:
+            return
         try:
             self.cap = cv2.VideoCapture(self.video_path)
             if self.cap.isOpened():
                 self.frame_count = int(self.cap.get(cv2.CAP_PROP_FRAME_COUNT))
                 self.fps = self.cap.get(cv2.CAP_PROP_FPS) or 30
+                self.seek_slider.blockSignals(True)
                 self.seek_slider.setMaximum(max(1, self.frame_count - 1))
+                self.seek_slider.blockSignals(False)
                 
                 # 最初のフレームを表示
                 self._show_frame(0)
@@ -91,47 +126,69 @@ class VideoPreviewWidget(QWidget):
             print(f"Video open error: {e}")
     
     def _show_frame(self, frame_idx: int):
-        """指定フレームを表示"""
+        """指定フレームへシークして表示 (シークバー操作用)"""
         if not self.cap or not self.cap.isOpened():
             return
         
         try:
             self.cap.set(cv2.CAP_PROP_POS_FRAMES, frame_idx)
-            ret, frame = self.cap.read()
-            if ret and frame is not None:
-                # BGR -> RGB
-                frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                h, w, ch = frame_rgb.shape
-                
-                # QImageに変換
-                bytes_per_line = ch * w
-                q_img = QImage(frame_rgb.data, w, h, bytes_per_line, QImage.Format_RGB888)
-                
-                # ラベルサイズにスケール
-                pixmap = QPixmap.fromImage(q_img).scaled(
-                    self.preview_label.size(),
-                    Qt.KeepAspectRatio,
-                    Qt.SmoothTransformation
-                )
-                self.preview_label.setPixmap(pixmap)
-                
-                # 時間更新
-                self.current_frame = frame_idx
-                current_sec = frame_idx / self.fps if self.fps > 0 else 0
-                self.time_label.setText(f"{int(current_sec//60):02d}:{int(current_sec%60):02d}")
+            self._read_and_display(frame_idx)
+        except Exception:
+            pass
+    
+    def _advance_frames(self, count: int):
+        """
+        現在位置から count フレーム進めて表示 (自動再生用)
+        途中のフレームは grab() のみでデコードせず、シークもしない
+        """
+        if not self.cap or not self.cap.isOpened():
+            return
+        
+        try:
+            for _ in range(count - 1):
+                if not self.cap.grab():
+                    return
+            self._read_and_display(self.current_frame + count)
         except Exception:
             pass
     
+    def _read_and_display(self, frame_idx: int):
+        """現在位置のフレームを読み込んで表示 (frame_idx は表示上の位置)"""
+        ret, frame = self.cap.read(self._frame_buf)
+        if ret and frame is not None:
+            self._frame_buf = frame
+            h, w, ch = frame.shape
+            
+            # QImageに変換 (BGR の並びのまま渡し、RGB への変換コピーをしない)
+            bytes_per_line = ch * w
+            q_img = QImage(frame.data, w, h, bytes_per_line, QImage.Format_BGR888)
+            
+            # ラベルサイズにスケール
+            pixmap = QPixmap.fromImage(q_img).scaled(
+                self.preview_label.size(),
+                Qt.KeepAspectRatio,
+                Qt.SmoothTransformation
+            )
+            self.preview_label.setPixmap(pixmap)
+            
+            # 時間更新
+            self.current_frame = frame_idx
+            current_sec = frame_idx / self.fps if self.fps > 0 else 0
+            self.time_label.setText(f"{int(current_sec//60):02d}:{int(current_sec%60):02d}")
+    
     def _next_frame(self):
         """次のフレームへ (自動再生用)"""
-        next_idx = self.current_frame + int(self.fps / 5)  # 5fps相当でスキップ
-        if next_idx >= self.frame_count:
-            next_idx = 0  # ループ
+        step = max(1, int(self.fps / 5))  # 5fps相当でスキップ
+        next_idx = self.current_frame + step
         
         self.seek_slider.blockSignals(True)
-        self.seek_slider.setValue(next_idx)
+        if next_idx >= self.frame_count:
+            self.seek_slider.setValue(0)
+            self._show_frame(0)  # ループ (先頭へはシークする)
+        else:
+            self.seek_slider.setValue(next_idx)
+            self._advance_frames(step)
         self.seek_slider.blockSignals(False)
-        self._show_frame(next_idx)
     
     def _on_seek(self, value):
         """シークバー操作"""
@@ -168,16 +225,104 @@ class VideoPreviewWidget(QWidget):
     
     def closeEvent(self, event):
         """クリーンアップ"""
-        self.timer.stop()
-        if self.cap:
-            self.cap.release()
+        self.release()
         super().closeEvent(event)
-    
-    def __del__(self):
-        """デストラクタ"""
-        self.timer.stop()
-        if self.cap:
-            self.cap.release()
+
+
+# ホバープレビュー用のポップアップ (全サムネイルで1つを使い回す)
+_preview_popup = None
+
+
+def _shared_preview_popup() -> VideoPreviewWidget:
+    global _preview_popup
+    if _preview_popup is None:
+        _preview_popup = VideoPreviewWidget()
+        _preview_popup.setWindowFlags(Qt.ToolTip | Qt.FramelessWindowHint)
+    return _preview_popup
+
+
+def load_video_thumbnail(video_path: str) -> Optional[QImage]:
+    """
+    最初のフレームを THUMBNAIL_SIZE に縮小した QImage (読めない場合は None)
+    画像のサムネイルと同じディスクキャッシュに保存し、次回以降は動画を開かない
+    QPixmap を使わないのでワーカースレッドから呼べる
+    """
+    cache_path = thumbnail_cache_path(thumbnail_cache_dir(), video_path)
+    image = QImage(cache_path) if cache_path else QImage()
+    if not image.isNull():
+        try:
+            os.utime(cache_path)  # 使用日時を更新 (整理時に残す)
+        except OSError:
+            pass
+        return image
+    image = _read_first_frame(video_path)
+    if image is not None and cache_path:
+        # 一時ファイル経由で置き換え (読みかけのキャッシュを壊さない)
+        tmp_path = f"{cache_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            if image.save(tmp_path, "WEBP", 80):
+                os.replace(tmp_path, cache_path)
+        except OSError:
+            pass
+    return image
+
+
+def _read_first_frame(video_path: str) -> Optional[QImage]:
+    """最初のフレームを THUMBNAIL_SIZE に縮小した QImage (読めない場合は None)"""
+    try:
+        cap = cv2.VideoCapture(video_path)
+        try:
+            ret, frame = cap.read() if cap.isOpened() else (False, None)
+        finally:
+            cap.release()
+        if not ret:
+            return None
+        h, w, ch = frame.shape
+        q_img = QImage(frame.data, w, h, ch * w, QImage.Format_BGR888)
+        # scaled() は新しいバッファを持つので frame の寿命に依存しない
+        return q_img.scaled(THUMBNAIL_SIZE, THUMBNAIL_SIZE, Qt.KeepAspectRatio,
+                            Qt.SmoothTransformation)
+    except Exception:
+        return None
+
+
+# 動画サムネイル読み込み専用のスレッドプール (スキャンや終了時の待機と切り離す)
+_video_thumbnail_pool = None
+
+
+def video_thumbnail_pool() -> QThreadPool:
+    """動画サムネイル用のスレッドプール (初回に作成)"""
+    global _video_thumbnail_pool
+    if _video_thumbnail_pool is None:
+        _video_thumbnail_pool = QThreadPool()
+    return _video_thumbnail_pool
+
+
+def cancel_video_thumbnails():
+    """開始前の動画サムネイル読み込みを取り消す (実行中のものはそのまま終わらせる)"""
+    if _video_thumbnail_pool is not None:
+        _video_thumbnail_pool.clear()
+
+
+class _VideoThumbnailSignals(QObject):
+    loaded = Signal(QImage)
+
+
+class _VideoThumbnailTask(QRunnable):
+    """
+    load_video_thumbnail を QThreadPool 上で実行し、結果をシグナルでGUIスレッドへ送る
+    QRunnable は QObject ではないため、シグナルは別の QObject に持たせる
+    """
+
+    def __init__(self, video_path: str):
+        super().__init__()
+        self.video_path = video_path
+        self.signals = _VideoThumbnailSignals()
+
+    def run(self):
+        image = load_video_thumbnail(self.video_path)
+        if image is not None:
+            self.signals.loaded.emit(image)
 
 
 class VideoThumbnailWidget(QFrame):
@@ -191,7 +336,6 @@ class VideoThumbnailWidget(QFrame):
         super().__init__(parent)
         self.video_path = video_path
         self.duration = duration
-        self.preview_popup = None
         
         self.setObjectName("card")
         self.setCursor(Qt.PointingHandCursor)
@@ -211,7 +355,6 @@ class VideoThumbnailWidget(QFrame):
         info_layout = QVBoxLayout()
         info_layout.setSpacing(2)
         
-        import os
         filename = os.path.basename(video_path)
         self.name_label = QLabel(filename)
         self.name_label.setStyleSheet("font-weight: bold;")
@@ -226,44 +369,39 @@ class VideoThumbnailWidget(QFrame):
         layout.addLayout(info_layout, 1)
     
     def _load_thumbnail(self):
-        """最初のフレームをサムネイルとして読み込み"""
-        try:
-            cap = cv2.VideoCapture(self.video_path)
-            if cap.isOpened():
-                ret, frame = cap.read()
-                if ret:
-                    frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                    h, w, ch = frame_rgb.shape
-                    q_img = QImage(frame_rgb.data, w, h, ch * w, QImage.Format_RGB888)
-                    pixmap = QPixmap.fromImage(q_img).scaled(
-                        self.thumb_label.size(),
-                        Qt.KeepAspectRatio,
-                        Qt.SmoothTransformation
-                    )
-                    self.thumb_label.setPixmap(pixmap)
-            cap.release()
-        except Exception:
-            pass
+        """サムネイルの読み込みをスレッドプールで開始 (ネットワーク上の動画は開くだけで数秒かかる)"""
+        task = _VideoThumbnailTask(self.video_path)
+        task.signals.loaded.connect(self._on_thumbnail_loaded)
+        video_thumbnail_pool().start(task)
+    
+    def _on_thumbnail_loaded(self, image: QImage):
+        pixmap = QPixmap.fromImage(image).scaled(
+            self.thumb_label.size(),
+            Qt.KeepAspectRatio,
+            Qt.SmoothTransformation
+        )
+        self.thumb_label.setPixmap(pixmap)
     
     def enterEvent(self, event):
         """ホバー時にプレビューポップアップ"""
-        if not self.preview_popup:
-            self.preview_popup = VideoPreviewWidget(self.video_path)
-            self.preview_popup.setWindowFlags(Qt.ToolTip | Qt.FramelessWindowHint)
+        popup = _shared_preview_popup()
+        if popup.video_path != self.video_path or popup.cap is None:
+            popup.set_video(self.video_path)
         
         # ウィジェット右側に表示
         global_pos = self.mapToGlobal(self.rect().topRight())
-        self.preview_popup.move(global_pos.x() + 10, global_pos.y())
-        self.preview_popup.show()
-        self.preview_popup.start_preview()
+        popup.move(global_pos.x() + 10, global_pos.y())
+        popup.show()
+        popup.start_preview()
         
         super().enterEvent(event)
     
     def leaveEvent(self, event):
         """ホバー解除でポップアップ非表示"""
-        if self.preview_popup:
-            self.preview_popup.stop_preview()
-            self.preview_popup.hide()
+        if _preview_popup is not None:
+            # 次にホバーされるまで動画ファイルを開いたままにしない (enterEvent で開き直す)
+            _preview_popup.release()
+            _preview_popup.hide()
         super().leaveEvent(event)
     
     def mousePressEvent(self, event):